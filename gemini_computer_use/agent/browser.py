@@ -1,301 +1,189 @@
 """Handle Playwright browser lifecycle and page interactions."""
-import time
 import asyncio
 from typing import Optional, Dict, Any
-from playwright.sync_api import sync_playwright
-from playwright.async_api import async_playwright
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
-from .utils import denormalize_x, denormalize_y, time_logger
+from .sync_wrapper import SyncWrapper
+from .utils import denormalize, time_logger
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
-class BrowserManager:
-    """Manages all interactions with playwright browser"""
-
-    def __init__(self,
-                 page_width: int = 1440,
-                 page_height: int = 900,
-                 headless: bool = True):
-        
-        self.width = page_width
-        self.height = page_height
-        self.headless_mode = headless
-
-        self.playwright = None
-        self.browser = None
-        self.context = None
-        self.page = None
-
-        self.actions_map = {
-            "open_web_browser": self.open_web_browser,
-            "wait_5_seconds": self.wait_5_seconds,
-            "go_back": self.go_back,
-            "go_forward": self.go_forward,
-            "search": self.search,
-            "navigate": self.navigate,
-            "click_at": self.click_at,
-            "hover_at": self.hover_at,
-            "type_text_at": self.type_text_at,
-            "key_combination": self.key_combination,
-            "scroll_document": self.scroll_document,
-            "scroll_at": self.scroll_at,
-            "drag_and_drop": self.drag_and_drop
-        }
-    
-    def start(self):
-        """Start playwright and create a browser page"""
-        logger.info(
-            "Starting Playwright browser in "
-            f"{'headless' if self.headless_mode else 'browser'} mode..."
-        )
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=self.headless_mode)
-        self.context = self.browser.new_context(
-            viewport={"width": self.width, "height": self.height}
-        )
-        self.page = self.context.new_page()
-        logger.info("BrowserManager initialized successfully.")
-        return self
-    
-    def close(self):
-        """Close browser and stop playwright"""
-        logger.info("Closing browser and cleaning up resources...")
-        try:
-            if self.browser:
-                self.browser.close()
-            if self.playwright:
-                self.playwright.stop()
-        except Exception as e:
-            logger.warning(f"Error during browser close: {e}")
-            raise
-        finally:
-            self.browser = None
-            self.context = None
-            self.page = None
-            self.playwright = None
-            logger.info("Browser closed successfully.")
-    
-    def goto(self, url: str):
-        """Navigates to the url"""
-        self.page.goto(url=url)
-    
-    def capture_screen(self, path: str | None = None) -> bytes:
-        """Capture the screenshot of page"""
-        if path:
-            return self.page.screenshot(path=path, type="png")
-        return self.page.screenshot(type="png")
-    
-    def get_current_url(self) -> str:
-        """Get the current url of page"""
-        return self.page.url
-    
-    def open_web_browser(self, **kwargs):
-        """Opens the web browser"""
-        # We are already doing this by default
-        # Reduces additional request to llm
-        pass
-
-    def wait_5_seconds(self, **kwargs):
-        """Waits for 5 seconds to load dynamic content"""
-        time.sleep(5)
-
-    def go_back(self, **kwargs):
-        """Go to the previous page in history"""
-        self.page.go_back()
-    
-    def go_forward(self, **kwargs):
-        """Go to the next page in history"""
-        self.page.go_forward()
-    
-    def search(self, **kwargs):
-        """Go to search engine to search and start the actions"""
-        # We'll default to google search for now
-        # NOTE: sometimes for security reasons, google might ask to solve captcha
-        # Other alternatives include duckduck go, brave search
-        self.page.goto("https://www.google.com/")
-    
-    def navigate(self, url: str, **kwargs):
-        """Go to the specified url"""
-        self.page.goto(url=url)
-    
-    def click_at(self, x: int, y: int, **kwargs):
-        """Click at a specific coordinates on the webpage"""
-        self.page.mouse.click(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-
-    def hover_at(self, x: int, y: int, **kwargs):
-        """Hover the mouse at a specific coordinate on the webpage"""
-        self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-
-    def type_text_at(self,
-                     text: str,
-                     x: int,
-                     y: int,
-                     press_enter: Optional[bool] = True,
-                     clear_before_typing: Optional[bool] = True,
-                     **kwargs):
-        """Type text at a specific coordinate"""
-        px, py = denormalize_x(x, width=self.width), denormalize_y(y, height=self.height)
-        self.page.mouse.click(px, py)
-        if clear_before_typing:
-            self.page.keyboard.press("Control+A") # Win/Linux: Control
-            self.page.keyboard.press("Backspace")
-        self.page.keyboard.type(text)
-        if press_enter:
-            self.page.keyboard.press("Enter")
-
-    def key_combination(self, keys: str, **kwargs):
-        """
-        Press keyboard keys or combinations, such as Control+C or Enter
-        """
-        self.page.keyboard.press(keys)
-
-    def scroll_document(self, direction: str = "down", **kwargs):
-        """Scrolls the entire webpage up, down, left, or right."""
-        direction = direction.lower()
-        if direction == "down":
-            self.page.keyboard.press("PageDown")
-        elif direction == "up":
-            self.page.keyboard.press("PageUp")
-        elif direction == "left":
-            # We'll keep 400 for now, inc/dec later if needed
-            self.page.evaluate("window.scrollBy(-400, 0)")
-        elif direction == "right":
-            self.page.evaluate("window.scrollBy(400, 0)")
-
-    def scroll_at(self,
-                  x: int,
-                  y: int,
-                  direction: str = "down",
-                  magnitude: Optional[int] = 800,
-                  **kwargs):
-        """
-        Scrolls a specific element or area at coordinate (x, y)
-        in the specified direction by a certain magnitude.
-        """
-        self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-        dy = magnitude if direction.lower() == "down" else -magnitude
-        self.page.mouse.wheel(0, dy)
-
-    def drag_and_drop(self,
-                      x: int,
-                      y: int,
-                      destination_x: int,
-                      destination_y: int,
-                      **kwargs):
-        """
-        Drags an element from a starting coordinate (x, y) and drops it at
-        a destination coordinate (destination_x, destination_y).
-        All coordinates are based on a 1000x1000 grid.
-
-        Args:
-            x: int (0-999)
-            y: int (0-999)
-            destination_x: int (0-999)
-            destination_y: int (0-999)
-        """
-        self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-        self.page.wait_for_load_state(state="networkidle")
-        self.page.mouse.down()
-        self.page.mouse.move(
-            denormalize_x(destination_x, width=self.width),
-            denormalize_y(destination_y, height=self.height)
-        )
-        self.page.wait_for_load_state(state="networkidle")
-        self.page.mouse.up()
-
-    def _wait_after_action(self, wait_time_s: int = 5):
-        """Wait for page stability after each action"""
-        try:
-            self.page.wait_for_load_state(state="networkidle",
-                                          timeout=wait_time_s * 1000)
-        except Exception:
-            pass
-        # Wait for additional 1s to settle things
-        time.sleep(1)
-
-    @time_logger
-    def execute_action(self,
-                       action_name: str,
-                       action_args: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute individual action"""
-        try:
-            execution_method = self.actions_map.get(action_name)
-            if not execution_method:
-                logger.warning(f"Action not implemented: {action_name}")
-                return {
-                    "warning": f"Action `{action_name}` was not implemented"
-                }
-            
-            logger.info(f"[ACTION] {action_name}: {action_args}")
-            
-            execution_method(**action_args)
-            
-            self._wait_after_action()
-            return {}
-        except Exception as e:
-            logger.error(f"Error executing action: '{action_name}': {e}", exc_info=True)
-            return {"error": str(e)}
+# Resources that don't change what the page does, only how fast it renders
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+BLOCKED_TRACKER_DOMAINS = (
+    "doubleclick.net",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "segment.io",
+    "hotjar.com",
+)
+
+# Action name -> (manager method, action kind)
+# The kind decides the wait after the action
+# "nav": loads a new document, "input": may mutate the page,
+# "read": only changes the view, "noop": doesn't touch the page
+ACTIONS: dict[str, tuple[str, str]] = {
+    "open_web_browser": ("open_web_browser", "noop"),
+    "wait_5_seconds": ("wait_5_seconds", "noop"),
+    "go_back": ("go_back", "nav"),
+    "go_forward": ("go_forward", "nav"),
+    "search": ("search", "nav"),
+    "navigate": ("navigate", "nav"),
+    "click_at": ("click_at", "input"),
+    "hover_at": ("hover_at", "read"),
+    "type_text_at": ("type_text_at", "input"),
+    "key_combination": ("key_combination", "input"),
+    "scroll_document": ("scroll_document", "read"),
+    "scroll_at": ("scroll_at", "read"),
+    "drag_and_drop": ("drag_and_drop", "input")
+}
+
+# Kinds that can't start a navigation, so there is nothing to wait for after them
+NO_WAIT_ACTION_KINDS = frozenset({"read", "noop"})
+
+# Upper bound in seconds for each action, so a slow page can't stall the whole turn
+ACTION_TIMEOUTS: dict[str, float] = {
+    "navigate": 15,
+    "search": 15,
+    "go_back": 10,
+    "go_forward": 10,
+    "wait_5_seconds": 7,
+    "click_at": 3,
+    "hover_at": 1,
+    "type_text_at": 5,
+    "key_combination": 3,
+    "scroll_document": 3,
+    "scroll_at": 3,
+    "drag_and_drop": 10
+}
+DEFAULT_ACTION_TIMEOUT = 10
+
+# Direction -> (operation, argument) for scroll_document
+# "press" sends a key, "eval" runs a script. We'll keep 400px horizontally for now
+SCROLL_DOCUMENT_OPS: dict[str, tuple[str, str]] = {
+    "down": ("press", "PageDown"),
+    "up": ("press", "PageUp"),
+    "left": ("eval", "window.scrollBy(-400, 0)"),
+    "right": ("eval", "window.scrollBy(400, 0)")
+}
+# Direction -> unit wheel delta (dx, dy) for scroll_at, scaled by the magnitude
+SCROLL_AT_DELTAS: dict[str, tuple[int, int]] = {
+    "down": (0, 1),
+    "up": (0, -1),
+    "left": (-1, 0),
+    "right": (1, 0)
+}
+
+# Focuses the plain text field under the point and optionally selects its value
+# Returns false for anything else (contenteditable, canvas, iframes...)
+FOCUS_TEXT_FIELD_JS = """
+([x, y, select]) => {
+    const el = document.elementFromPoint(x, y);
+    if (!el) return false;
+    const textInputTypes = ["text", "search", "url", "tel", "password", "email"];
+    const isTextField = el.tagName === "TEXTAREA"
+        || (el.tagName === "INPUT" && textInputTypes.includes(el.type));
+    if (!isTextField) return false;
+    el.focus();
+    if (select) el.select();
+    return true;
+}
+"""
+
+def _lookup_direction(table: dict, direction: str):
+    """Get the scroll table entry for a direction, rejecting unknown ones"""
+    try:
+        return table[direction.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported scroll direction: `{direction}`") from None
+
+def _warn_on_profile_conflicts(manager):
+    """Log the options that cancel out the persistent profile"""
+    if not manager.user_data_dir:
+        return
+    if manager.block_resources:
+        logger.warning("Resource blocking disables the http cache of the persistent profile.")
+    if manager.storage_state:
+        logger.warning("Storage state is ignored when a persistent profile is used.")
+
+def _should_block(request) -> bool:
+    """Check if a request should be aborted when resource blocking is enabled"""
+    resource_type = request.resource_type
+    # Never abort a navigation, the page itself is what the agent needs
+    if resource_type == "document":
+        return False
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    # Match trackers on the host only, their names can show up anywhere in a query string
+    host = urlsplit(request.url).hostname or ""
+    return any(host == domain or host.endswith("." + domain)
+               for domain in BLOCKED_TRACKER_DOMAINS)
 
 class AsyncBrowserManager:
     """Manages all interactions with playwright browser asynchronously"""
 
+    __slots__ = ("width", "height", "headless_mode", "screenshot_format", "screenshot_quality",
+                 "block_resources", "user_data_dir", "storage_state",
+                 "playwright", "browser", "context", "page")
+
     def __init__(self,
                  page_width: int = 1440,
                  page_height: int = 900,
-                 headless: bool = True):
+                 headless: bool = True,
+                 block_resources: bool = False,
+                 screenshot_format: str = "jpeg",
+                 screenshot_quality: int = 75,
+                 user_data_dir: Optional[str] = None,
+                 storage_state: Optional[str] = None):
         
         self.width = page_width
         self.height = page_height
         self.headless_mode = headless
+        self.screenshot_format = screenshot_format
+        self.screenshot_quality = screenshot_quality
+        # NOTE: Routing disables the http cache and blocked images/fonts
+        # won't show up in screenshots, so only enable it for text heavy tasks
+        self.block_resources = block_resources
+        # A persistent profile keeps the http cache and cookies across runs
+        self.user_data_dir = user_data_dir
+        # Cookies/local storage json to preload, for authenticated tasks
+        self.storage_state = storage_state
+        _warn_on_profile_conflicts(self)
 
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
-
-        self.actions_map = {
-            "open_web_browser": self.open_web_browser,
-            "wait_5_seconds": self.wait_5_seconds,
-            "go_back": self.go_back,
-            "go_forward": self.go_forward,
-            "search": self.search,
-            "navigate": self.navigate,
-            "click_at": self.click_at,
-            "hover_at": self.hover_at,
-            "type_text_at": self.type_text_at,
-            "key_combination": self.key_combination,
-            "scroll_document": self.scroll_document,
-            "scroll_at": self.scroll_at,
-            "drag_and_drop": self.drag_and_drop
-        }
     
     async def start(self):
         """Start playwright and create a browser page"""
-        logger.info(
-            "Starting Playwright browser in "
-            f"{'headless' if self.headless_mode else 'browser'} mode..."
-        )
+        logger.info("Starting Playwright browser in %s mode...",
+                    "headless" if self.headless_mode else "browser")
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless_mode)
-        self.context = await self.browser.new_context(
-            viewport={"width": self.width, "height": self.height}
-        )
-        self.page = await self.context.new_page()
+        if not self.user_data_dir:
+            self.browser = await self.playwright.chromium.launch(headless=self.headless_mode)
+        await self._open_context()
         logger.info("BrowserManager initialized successfully.")
         return self
+
+    async def _open_context(self):
+        """Create the browser context and its page"""
+        viewport = {"width": self.width, "height": self.height}
+        if self.user_data_dir:
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                self.user_data_dir, headless=self.headless_mode, viewport=viewport
+            )
+        else:
+            self.context = await self.browser.new_context(
+                viewport=viewport, storage_state=self.storage_state
+            )
+        if self.block_resources:
+            await self.context.route("**/*", self._route_request)
+        # Persistent contexts open with a blank page already
+        self.page = (self.context.pages[0] if self.context.pages
+                     else await self.context.new_page())
     
     async def close(self):
         """Close browser and stop playwright"""
@@ -303,10 +191,12 @@ class AsyncBrowserManager:
         try:
             if self.browser:
                 await self.browser.close()
+            elif self.context:
+                await self.context.close()
             if self.playwright:
                 await self.playwright.stop()
         except Exception as e:
-            logger.warning(f"Error during browser close: {e}")
+            logger.warning("Error during browser close: %s", e)
             raise
         finally:
             self.browser = None
@@ -315,15 +205,43 @@ class AsyncBrowserManager:
             self.playwright = None
             logger.info("Browser closed successfully.")
     
+    async def reset(self):
+        """Clear the session state so the browser can be reused by another run"""
+        if self.browser is None:
+            # A persistent profile keeps its state on disk by design, only drop the cookies
+            await self.context.clear_cookies()
+            await self.page.goto("about:blank")
+            return
+        # A fresh context drops storage, permissions and popups, the browser stays warm
+        context, self.context, self.page = self.context, None, None
+        await context.close()
+        await self._open_context()
+
+    async def _route_request(self, route):
+        """Abort requests for blocked resources, let everything else through"""
+        if _should_block(route.request):
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def goto(self, url: str):
         """Navigates to the url"""
         await self.page.goto(url=url)
     
-    async def capture_screen(self, path: str | None = None) -> bytes:
-        """Capture the screenshot of page"""
+    async def capture_screen(self,
+                             path: str | None = None,
+                             fmt: str | None = None,
+                             quality: int | None = None) -> bytes:
+        """Capture the screenshot of page, in the manager's format unless overridden"""
+        fmt = fmt or self.screenshot_format
+        # CSS scale keeps the capture at viewport size on HiDPI displays,
+        # matching the coordinate space actions are denormalized to
+        options = {"type": fmt, "full_page": False, "scale": "css"}
+        if fmt == "jpeg":
+            options["quality"] = quality or self.screenshot_quality
         if path:
-            return await self.page.screenshot(path=path, type="png")
-        return await self.page.screenshot(type="png")
+            options["path"] = path
+        return await self.page.screenshot(**options)
     
     async def get_current_url(self) -> str:
         """Get the current url of page"""
@@ -360,17 +278,11 @@ class AsyncBrowserManager:
     
     async def click_at(self, x: int, y: int, **kwargs):
         """Click at a specific coordinates on the webpage"""
-        await self.page.mouse.click(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
+        await self.page.mouse.click(*denormalize(x, y, self.width, self.height))
 
     async def hover_at(self, x: int, y: int, **kwargs):
         """Hover the mouse at a specific coordinate on the webpage"""
-        await self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
+        await self.page.mouse.move(*denormalize(x, y, self.width, self.height))
 
     async def type_text_at(self,
                            text: str,
@@ -380,12 +292,20 @@ class AsyncBrowserManager:
                            clear_before_typing: Optional[bool] = True,
                            **kwargs):
         """Type text at a specific coordinate"""
-        px, py = denormalize_x(x, width=self.width), denormalize_y(y, height=self.height)
+        px, py = denormalize(x, y, self.width, self.height)
         await self.page.mouse.click(px, py)
-        if clear_before_typing:
-            await self.page.keyboard.press("Control+A") # Win/Linux: Control
-            await self.page.keyboard.press("Backspace")
-        await self.page.keyboard.type(text)
+        # Plain text fields: select the old value in one round trip and insert
+        # the new text at once, instead of sending key events per character
+        if await self.page.evaluate(FOCUS_TEXT_FIELD_JS, [px, py, clear_before_typing]):
+            if text:
+                await self.page.keyboard.insert_text(text)
+            elif clear_before_typing:
+                await self.page.keyboard.press("Backspace")
+        else:
+            if clear_before_typing:
+                await self.page.keyboard.press("Control+A") # Win/Linux: Control
+                await self.page.keyboard.press("Backspace")
+            await self.page.keyboard.type(text)
         if press_enter:
             await self.page.keyboard.press("Enter")
 
@@ -397,16 +317,11 @@ class AsyncBrowserManager:
 
     async def scroll_document(self, direction: str = "down", **kwargs):
         """Scrolls the entire webpage up, down, left, or right."""
-        direction = direction.lower()
-        if direction == "down":
-            await self.page.keyboard.press("PageDown")
-        elif direction == "up":
-            await self.page.keyboard.press("PageUp")
-        elif direction == "left":
-            # We'll keep 400 for now, inc/dec later if needed
-            await self.page.evaluate("window.scrollBy(-400, 0)")
-        elif direction == "right":
-            await self.page.evaluate("window.scrollBy(400, 0)")
+        op, arg = _lookup_direction(SCROLL_DOCUMENT_OPS, direction)
+        if op == "press":
+            await self.page.keyboard.press(arg)
+        else:
+            await self.page.evaluate(arg)
 
     async def scroll_at(self,
                         x: int,
@@ -418,12 +333,9 @@ class AsyncBrowserManager:
         Scrolls a specific element or area at coordinate (x, y)
         in the specified direction by a certain magnitude.
         """
-        await self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-        dy = magnitude if direction.lower() == "down" else -magnitude
-        await self.page.mouse.wheel(0, dy)
+        unit_dx, unit_dy = _lookup_direction(SCROLL_AT_DELTAS, direction)
+        await self.page.mouse.move(*denormalize(x, y, self.width, self.height))
+        await self.page.mouse.wheel(unit_dx * magnitude, unit_dy * magnitude)
 
     async def drag_and_drop(self, 
                             x: int,
@@ -442,28 +354,30 @@ class AsyncBrowserManager:
             destination_x: int (0-999)
             destination_y: int (0-999)
         """
-        await self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-        await self.page.wait_for_load_state()
+        # Short bounded pauses let drag handlers register each step, the page itself
+        # is settled by the wait after the action
+        await self.page.mouse.move(*denormalize(x, y, self.width, self.height))
         await self.page.mouse.down()
+        await self.page.wait_for_timeout(50)
         await self.page.mouse.move(
-            denormalize_x(destination_x, width=self.width),
-            denormalize_y(destination_y, height=self.height)
+            *denormalize(destination_x, destination_y, self.width, self.height)
         )
-        await self.page.wait_for_load_state()
+        await self.page.wait_for_timeout(50)
         await self.page.mouse.up()
 
-    async def _wait_after_action(self, wait_time_s: int = 5):
-        """Wait for page stability after each action"""
+    async def _wait_after_action(self, action_kind: str, wait_time_s: int = 5):
+        """Wait for page stability after each action, based on the action kind"""
         try:
-            await self.page.wait_for_load_state(state="networkidle",
-                                                timeout=wait_time_s * 1000)
+            if action_kind == "nav":
+                await self.page.wait_for_load_state(state="load",
+                                                    timeout=wait_time_s * 1000)
+            else:
+                # Only catches navigations triggered by the action, anything else
+                # is covered by playwright's auto-waiting on the next action
+                await self.page.wait_for_load_state(state="domcontentloaded",
+                                                    timeout=1500)
         except Exception:
             pass
-        # Wait for additional 1s to settle things
-        await asyncio.sleep(1)
 
     @time_logger
     async def execute_action(self,
@@ -471,19 +385,105 @@ class AsyncBrowserManager:
                              action_args: Dict[str, Any]) -> Dict[str, Any]:
         """Execute individual action"""
         try:
-            execution_method = self.actions_map.get(action_name)
-            if not execution_method:
-                logger.warning(f"Action not implemented: {action_name}")
+            method_name, action_kind = ACTIONS.get(action_name, (None, None))
+            if not method_name:
+                logger.warning("Action not implemented: %s", action_name)
                 return {
                     "warning": f"Action `{action_name}` was not implemented"
                 }
             
-            logger.info(f"[ACTION] {action_name}: {action_args}")
+            logger.info("[ACTION] %s: %s", action_name, action_args)
             
-            await execution_method(**action_args)
+            await asyncio.wait_for(
+                getattr(self, method_name)(**action_args),
+                timeout=ACTION_TIMEOUTS.get(action_name, DEFAULT_ACTION_TIMEOUT)
+            )
             
-            await self._wait_after_action()
+            if action_kind not in NO_WAIT_ACTION_KINDS:
+                await self._wait_after_action(action_kind)
             return {}
+        except (asyncio.TimeoutError, PlaywrightTimeoutError):
+            logger.warning("Action timed out: %s", action_name)
+            return {"error": "action timed out"}
         except Exception as e:
-            logger.error(f"Error executing action: '{action_name}': {e}", exc_info=True)
+            logger.error("Error executing action: '%s': %s", action_name, e, exc_info=True)
             return {"error": str(e)}
+
+class BrowserManager(SyncWrapper):
+    """Sync facade over AsyncBrowserManager, running it on a private event loop"""
+
+    def __init__(self, *args, **kwargs):
+        """Takes the same arguments as AsyncBrowserManager"""
+        super().__init__(AsyncBrowserManager(*args, **kwargs))
+
+    def start(self):
+        """Start playwright and create a browser page"""
+        self.run_sync(self._wrapped.start())
+        return self
+
+class BrowserPool:
+    """Pool of pre-started async browser managers shared across agent runs"""
+
+    def __init__(self, size: int = 2, **manager_kwargs):
+        """Initializes the pool, browsers are launched on `start`.
+
+        Args:
+            size: Number of browsers kept warm, also caps concurrent runs.
+            manager_kwargs: Arguments passed to each AsyncBrowserManager.
+        """
+        self.size = size
+        self.manager_kwargs = manager_kwargs
+        self._managers: list[AsyncBrowserManager] = []
+        self._available: asyncio.Queue[AsyncBrowserManager] = asyncio.Queue(maxsize=size)
+        # Browsers that failed to restart, rebuilt the next time one is needed
+        self._missing = 0
+
+    async def start(self):
+        """Launch all browsers in the pool"""
+        logger.info("Starting browser pool with %s browsers...", self.size)
+        managers = await asyncio.gather(*[self._launch() for _ in range(self.size)])
+        for manager in managers:
+            self._available.put_nowait(manager)
+        return self
+
+    async def acquire(self) -> AsyncBrowserManager:
+        """Wait for a browser to be free and take it"""
+        if self._available.empty() and self._missing:
+            self._missing -= 1
+            try:
+                return await self._launch()
+            except Exception:
+                self._missing += 1
+                raise
+        return await self._available.get()
+
+    async def release(self, manager: AsyncBrowserManager):
+        """Reset the browser and hand it back to the pool"""
+        try:
+            await manager.reset()
+        except Exception as e:
+            logger.warning("Unable to reset pooled browser, replacing it: %s", e)
+            self._managers.remove(manager)
+            try:
+                await manager.close()
+            except Exception:
+                pass
+            try:
+                manager = await self._launch()
+            except Exception as e:
+                logger.error("Unable to replace pooled browser, rebuilding it on demand: %s", e)
+                self._missing += 1
+                return
+        self._available.put_nowait(manager)
+
+    async def _launch(self) -> AsyncBrowserManager:
+        """Start a new browser for the pool"""
+        manager = await AsyncBrowserManager(**self.manager_kwargs).start()
+        self._managers.append(manager)
+        return manager
+
+    async def close(self):
+        """Close all browsers in the pool"""
+        await asyncio.gather(*[manager.close() for manager in self._managers],
+                             return_exceptions=True)
+        self._managers = []
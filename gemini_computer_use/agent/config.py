@@ -14,6 +14,24 @@ MODEL_NAME = "gemini-2.5-computer-use-preview-10-2025"
 
 SAFETY_AUTO_PROCEED = os.getenv("SAFETY_AUTO_PROCEED", "true").lower() == "true"
 
+# Abort image/font/media and tracker requests to speed up page loads
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "false").lower() == "true"
+
+# Persistent browser profile for the CLI, reuses the http cache and cookies across runs
+# Not used by the API pool, a profile directory can only be opened by one browser at a time
+USER_DATA_DIR = os.getenv("CUA_USER_DATA_DIR")
+# Storage state json (cookies, local storage) to preload, ignored with a persistent profile
+STORAGE_STATE = os.getenv("CUA_STORAGE_STATE")
+
+# Replay previously seen action turns for the same page/goal without calling the llm
+# The model doesn't see the page before a replayed turn, so keep it for repetitive tasks
+SKILL_CACHE = os.getenv("SKILL_CACHE", "false").lower() == "true"
+SKILL_CACHE_PATH = os.getenv("SKILL_CACHE_PATH")
+SKILL_CACHE_SIZE = 100
+
+# Async agent only: stream model turns and start leading read only actions before generation ends
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "false").lower() == "true"
+
 if not GEMINI_API_KEY and not USE_VERTEXAI:
     raise ValueError("Please set either GEMINI_API_KEY or USE_VERTEXAI=true in .env")
 
@@ -23,6 +41,18 @@ if USE_VERTEXAI and (not VERTEXAI_PROJECT_ID or not VERTEXAI_LOCATION):
 SCREEN_WIDTH = 1440
 SCREEN_HEIGHT = 900
 
+# JPEG is much smaller and faster to encode than PNG for UI screenshots
+# Use "png" for lossless frames, quality only applies to jpeg
+SCREENSHOT_FORMAT = "jpeg"
+SCREENSHOT_QUALITY = 75
+
+# Only the last few turns keep their screenshots in the llm history
+# Older turns are sent as text only, which keeps requests small on long runs
+MAX_SCREENSHOT_TURNS = 3
+
+# Upload each new screenshot once via the Files API and reference it by uri (API key only)
+UPLOAD_SCREENSHOTS = os.getenv("UPLOAD_SCREENSHOTS", "false").lower() == "true"
+
 # Default value, expects url from CLI else starts with search engine
 INITIAL_URL = None
 
@@ -32,4 +62,7 @@ INITIAL_URL = None
 # Try to solve a captcha
 # INITIAL_URL = "https://2captcha.com/demo/recaptcha-v2"
 
-MAX_AGENT_TURNS = 20
\ No newline at end of file
+MAX_AGENT_TURNS = 20
+
+# Number of warm browsers kept by the API server, also caps concurrent agent runs
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
\ No newline at end of file
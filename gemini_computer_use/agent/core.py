@@ -1,156 +1,141 @@
 """Main agent orchestration logic"""
-from typing import Optional, List, Dict, Any
+import asyncio
+import logging
+from typing import Optional, List, Dict, Any, AsyncIterator
+from google.genai import types
 
 from .gemini_client import GeminiComputerUseClient
-from .browser import BrowserManager, AsyncBrowserManager
+from .browser import BrowserManager, AsyncBrowserManager, BrowserPool
+from .sync_wrapper import SyncWrapper
+from .skill_cache import SkillCache
 from .utils import get_safety_confirmation, time_logger
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
-class ComputerUseAgent:
-    """Class for orchestrating the computer use agent"""
+# Actions that send at most a single input event to the page and never navigate.
+# Consecutive calls of these can be dispatched together without their events
+# interleaving, multi-event actions (scroll_at, key_combination) are excluded.
+PARALLEL_SAFE_ACTIONS = frozenset({"open_web_browser", "hover_at"})
 
-    def __init__(self,
-                 llm_client: GeminiComputerUseClient,
-                 browser_manager: BrowserManager,
-                 max_turns: int = 20):
-        self.llm = llm_client
-        self.browser = browser_manager
-        self.max_turns = max_turns
-
-    def _execute_function_calls(self, function_calls):
-        """Executes the function calls using browser actions"""
-        results = []
-        for fc in function_calls:
-            fc_name = fc.name
-            fc_args = dict(fc.args or {})
-            action_result = {}
-
-            if "safety_decision" in fc_args:
-                decision = get_safety_confirmation(fc_args["safety_decision"])
-                if decision == "TERMINATE":
-                    logger.warning("Terminating agent loop due to safety request.")
-                    break
-                action_result["safety_acknowledgement"] = "true"
-        
-            result = self.browser.execute_action(fc_name, fc_args)
-            action_result.update(result)
-            results.append((fc_name, action_result))
-        return results
-
-    @time_logger
-    def run(self, goal: str, initial_url: Optional[str] = None):
-        """Runs the main agent loop"""
-        final_response = ""
-        termination_reason = "ERROR"
-        action_history: List[Dict[str, Any]] = []
-        final_screenshot: bytes = b""
-
-        try:
-            self.browser.start()
-            if initial_url:
-                logger.info(f"Starting browser with url: {initial_url}")
-                self.browser.goto(initial_url)
-            else:
-                logger.info("No initial URL provided. Opening default search engine.")
-                self.browser.search()
-
-            logger.info(f"Agent goal: {goal}")
-
-            # Capture initial state
-            initial_image = self.browser.capture_screen()
-            contents = self.llm.build_initial_message(goal, initial_image)
-
-            # Run the react loop for max_turns
-            for turn in range(self.max_turns):
-                logger.info(f"===== Turn {turn + 1}/{self.max_turns} =====")
-                
-                # Generate content
-                response = self.llm.generate_content(contents)
-                # logger.info(f"[RESPONSE] {response.model_dump()}")
-                candidate = response.candidates[0]
-                contents.append(candidate.content)
-
-                function_calls = [
-                    p.function_call
-                    for p in candidate.content.parts
-                    if getattr(p, "function_call", None)
-                ]
-
-                # If no function calls, then task complete
-                if not function_calls:
-                    final_response = " ".join(
-                        [p.text for p in candidate.content.parts if p.text]
-                    )
-                    logger.info(f"[Final Output]: {final_response}")
-                    termination_reason = "COMPLETED"
-                    break
-                
-                # Execute actions and send back screenshots
-                action_results = self._execute_function_calls(function_calls)
-
-                for i, fc in enumerate(function_calls):
-                    action_history.append({
-                        "turn": turn + 1,
-                        "action_name": fc.name,
-                        "action_args": dict(fc.args or {}),
-                        "result": action_results[i][1]
-                    })
-
-                screenshot = self.browser.capture_screen()
-                current_url = self.browser.get_current_url()
+# Actions that leave the rendered page untouched, a screenshot taken before
+# them is still valid after. Hover/scroll are not here as both change the view.
+SCREEN_PRESERVING_ACTIONS = frozenset({"open_web_browser"})
 
-                function_response_content = self.llm.build_function_responses_message(
-                    screenshot=screenshot,
-                    current_url=current_url,
-                    results=action_results
-                )
+def _is_parallel_safe(fc_name: str) -> bool:
+    """Check if the action can be batched with its neighbours in the same turn"""
+    return fc_name in PARALLEL_SAFE_ACTIONS
 
-                # Update state with function responses
-                contents.append(function_response_content)
-            else:
-                # Reached max_turns without reaching a final output
-                logger.warning("Exhausted maximum number of turns. Unable to achieve goal.")
-                final_response = "Goal not completed within the maximum turn limit."
-                termination_reason = "MAX_TURNS_EXCEEDED"
-
-        except Exception as e:
-            logger.error(f"Agent encountered an error: {e}", exc_info=True)
-            final_response = f"Agent terminated due to error: {e}"
-            termination_reason = "ERROR"
-        finally:
-            if self.browser and self.browser.page:
-                final_screenshot = self.browser.capture_screen()
-
-            self.browser.close()
-        
-        return {
-            "final_message": final_response,
-            "action_history": action_history,
-            "termination_reason": termination_reason,
-            "final_screenshot_bytes": final_screenshot
-        }
+def _continues_text(parts: List[types.Part], part: types.Part) -> bool:
+    """Check if a streamed part carries more of the text of the previous one"""
+    if not parts or part.text is None or parts[-1].text is None:
+        return False
+    return not part.function_call and bool(part.thought) == bool(parts[-1].thought)
 
 class AsyncComputerUseAgent:
     """Class for orchestrating the computer use agent asynchronously"""
 
     def __init__(self,
                  llm_client: GeminiComputerUseClient,
-                 browser_manager: AsyncBrowserManager,
-                 max_turns: int = 20):
+                 browser_manager: Optional[AsyncBrowserManager] = None,
+                 max_turns: int = 20,
+                 skill_cache: Optional[SkillCache] = None,
+                 browser_pool: Optional[BrowserPool] = None,
+                 stream_responses: bool = False):
+        if browser_manager is None and browser_pool is None:
+            raise ValueError(
+                "AsyncComputerUseAgent requires either `browser_manager` or `browser_pool`."
+            )
         self.llm = llm_client
+        # With a pool, a warm browser is acquired for each run instead
         self.browser = browser_manager
+        self.browser_pool = browser_pool
         self.max_turns = max_turns
-
-    async def _execute_function_calls(self, function_calls):
-        """Executes the function calls using browser actions"""
+        # Replays cached action turns instead of asking the llm, None disables it
+        self.skill_cache = skill_cache
+        # Start leading parallel safe actions while the model is still generating
+        self.stream_responses = stream_responses
+
+    async def _stream_model_turn(self, contents):
+        """Streams the next model turn, starting leading parallel safe actions early.
+
+        Dispatch stops at the first safety decision or non parallel safe call,
+        everything from there on runs after the stream completes.
+        Returns the model content and the tasks started for the leading calls.
+        """
+        parts = []
+        started = []
+        dispatching = True
+        try:
+            async for part in self.llm.generate_content_stream_async(contents):
+                if _continues_text(parts, part):
+                    # Text streams in arbitrary chunks, keep it as one part like a full response
+                    parts[-1] = parts[-1].model_copy(update={
+                        "text": parts[-1].text + part.text,
+                        "thought_signature": part.thought_signature or parts[-1].thought_signature,
+                    })
+                    continue
+                parts.append(part)
+                fc = part.function_call
+                if not fc or not dispatching:
+                    continue
+                fc_args = dict(fc.args or {})
+                if "safety_decision" in fc_args or not _is_parallel_safe(fc.name):
+                    dispatching = False
+                    continue
+                started.append(
+                    asyncio.create_task(self.browser.execute_action(fc.name, fc_args))
+                )
+        except BaseException:
+            # Don't leave actions running against the page if the stream fails
+            for task in started:
+                task.cancel()
+            await asyncio.gather(*started, return_exceptions=True)
+            raise
+
+        return types.Content(role="model", parts=parts), started
+
+    async def _execute_function_calls(self, function_calls, started=()):
+        """Executes the function calls using browser actions.
+
+        Runs of consecutive parallel safe calls are dispatched together with
+        asyncio.gather, everything else is executed sequentially in order.
+        `started` holds the tasks already running for the leading calls.
+        """
         results = []
+        pending_run = []
+
+        if started:
+            started_results = await asyncio.gather(*started)
+            results.extend(
+                (fc.name, result) for fc, result in zip(function_calls, started_results)
+            )
+            function_calls = function_calls[len(started):]
+
+        async def flush_pending_run():
+            if not pending_run:
+                return
+            run_results = await asyncio.gather(*[
+                self.browser.execute_action(fc.name, dict(fc.args or {}))
+                for fc in pending_run
+            ])
+            results.extend(
+                (fc.name, result) for fc, result in zip(pending_run, run_results)
+            )
+            pending_run.clear()
+
         for fc in function_calls:
             fc_name = fc.name
             fc_args = dict(fc.args or {})
             action_result = {}
 
+            if "safety_decision" not in fc_args and _is_parallel_safe(fc_name):
+                pending_run.append(fc)
+                continue
+
+            # Sequential barrier, batched actions before this one must land first
+            await flush_pending_run()
+
             if "safety_decision" in fc_args:
                 decision = get_safety_confirmation(fc_args["safety_decision"])
                 if decision == "TERMINATE":
@@ -161,78 +146,153 @@ class AsyncComputerUseAgent:
             result = await self.browser.execute_action(fc_name, fc_args)
             action_result.update(result)
             results.append((fc_name, action_result))
+
+        await flush_pending_run()
         return results
 
     @time_logger
     async def run(self, goal: str, initial_url: Optional[str] = None):
         """Runs the main agent loop"""
+        action_history: List[Dict[str, Any]] = []
+        final_event: Dict[str, Any] = {}
+        async for event in self.run_iter(goal, initial_url):
+            if event["type"] == "action":
+                action_history.append({k: v for k, v in event.items() if k != "type"})
+            else:
+                final_event = event
+
+        return {
+            "final_message": final_event["final_message"],
+            "action_history": action_history,
+            "termination_reason": final_event["termination_reason"],
+            "final_screenshot_bytes": final_event["final_screenshot_bytes"]
+        }
+
+    async def run_iter(self,
+                       goal: str,
+                       initial_url: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Runs the main agent loop, yielding each executed action as it completes.
+
+        Action events carry `turn`, `action_name`, `action_args` and `result`,
+        the last event has type "final" with the outcome and final screenshot.
+        """
         final_response = ""
         termination_reason = "ERROR"
-        action_history: List[Dict[str, Any]] = []
         final_screenshot: bytes = b""
+        last_screenshot: bytes = b""
+        # Files API uri of last_screenshot, when uploads are enabled
+        last_screenshot_uri: Optional[str] = None
+        screen_changed = True
 
         try:
-            await self.browser.start()
+            if self.browser_pool is not None:
+                self.browser = await self.browser_pool.acquire()
+            else:
+                await self.browser.start()
             if initial_url:
-                logger.info(f"Starting browser with url: {initial_url}")
+                logger.info("Starting browser with url: %s", initial_url)
                 await self.browser.goto(initial_url)
             else:
                 logger.info("No initial URL provided. Opening default search engine.")
                 await self.browser.search()
 
-            logger.info(f"Agent goal: {goal}")
+            logger.info("Agent goal: %s", goal)
 
             # Capture initial state
-            initial_image = await self.browser.capture_screen()
+            initial_image, current_url = await asyncio.gather(
+                self.browser.capture_screen(), self.browser.get_current_url()
+            )
+            last_screenshot, screen_changed = initial_image, False
             contents = self.llm.build_initial_message(goal, initial_image)
+            last_action_name, last_action_args = "", {}
+            # Skill keys already seen this run, each is replayed at most once
+            seen_skill_keys = set()
 
             # Run the react loop for max_turns
             for turn in range(self.max_turns):
-                logger.info(f"===== Turn {turn + 1}/{self.max_turns} =====")
-                
-                # Generate content
-                response = await self.llm.generate_content_async(contents)
-                # logger.info(f"[RESPONSE] {response.model_dump()}")
-                candidate = response.candidates[0]
-                contents.append(candidate.content)
+                logger.info("===== Turn %s/%s =====", turn + 1, self.max_turns)
+
+                skill_key, model_content, started = None, None, []
+                if self.skill_cache is not None:
+                    skill_key = self.skill_cache.make_key(
+                        current_url, goal, last_action_name, last_action_args, last_screenshot
+                    )
+                    # A repeated key means the last turn left the page as it was, replaying
+                    # the same turn again would loop, so the model decides instead
+                    if skill_key not in seen_skill_keys:
+                        model_content = self.skill_cache.get(skill_key)
+                    seen_skill_keys.add(skill_key)
+
+                if model_content is not None:
+                    logger.info("[SKILL CACHE] Replaying cached actions, skipping llm call.")
+                elif self.stream_responses:
+                    model_content, started = await self._stream_model_turn(contents)
+                else:
+                    # Generate content
+                    response = await self.llm.generate_content_async(contents)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[RESPONSE] %s", response.model_dump())
+                    model_content = response.candidates[0].content
+                contents.append(model_content)
 
                 function_calls = [
                     p.function_call
-                    for p in candidate.content.parts
+                    for p in model_content.parts
                     if getattr(p, "function_call", None)
                 ]
 
                 # If no function calls, then task complete
                 if not function_calls:
                     final_response = " ".join(
-                        [p.text for p in candidate.content.parts if p.text]
+                        [p.text for p in model_content.parts if p.text]
                     )
-                    logger.info(f"[Final Output]: {final_response}")
+                    logger.info("[Final Output]: %s", final_response)
                     termination_reason = "COMPLETED"
                     break
+
+                if skill_key is not None:
+                    self.skill_cache.put(skill_key, model_content)
+                last_action_name = function_calls[-1].name
+                last_action_args = dict(function_calls[-1].args or {})
                 
                 # Execute actions and send back screenshots
-                action_results = await self._execute_function_calls(function_calls)
+                action_results = await self._execute_function_calls(function_calls, started)
+                screen_changed = not all(
+                    fc.name in SCREEN_PRESERVING_ACTIONS for fc in function_calls
+                )
 
                 for i, fc in enumerate(function_calls):
-                    action_history.append({
+                    yield {
+                        "type": "action",
                         "turn": turn + 1,
                         "action_name": fc.name,
                         "action_args": dict(fc.args or {}),
                         "result": action_results[i][1]
-                    })
+                    }
 
-                screenshot = await self.browser.capture_screen()
-                current_url = await self.browser.get_current_url()
+                if screen_changed:
+                    last_screenshot, current_url = await asyncio.gather(
+                        self.browser.capture_screen(), self.browser.get_current_url()
+                    )
+                    screen_changed = False
+                    if self.llm.upload_screenshots:
+                        last_screenshot_uri = await self.llm.upload_screenshot_async(
+                            last_screenshot
+                        )
+                else:
+                    current_url = await self.browser.get_current_url()
+                screenshot = last_screenshot
 
                 function_response_content = self.llm.build_function_responses_message(
                     screenshot=screenshot,
                     current_url=current_url,
-                    results=action_results
+                    results=action_results,
+                    screenshot_uri=last_screenshot_uri
                 )
 
                 # Update state with function responses
                 contents.append(function_response_content)
+                self.llm.trim_screenshot_history(contents)
             else:
                 # Reached max_turns without reaching a final output
                 logger.warning("Exhausted maximum number of turns. Unable to achieve goal.")
@@ -240,18 +300,52 @@ class AsyncComputerUseAgent:
                 termination_reason = "MAX_TURNS_EXCEEDED"
 
         except Exception as e:
-            logger.error(f"Agent encountered an error: {e}", exc_info=True)
+            logger.error("Agent encountered an error: %s", e, exc_info=True)
             final_response = f"Agent terminated due to error: {e}"
             termination_reason = "ERROR"
         finally:
-            if self.browser and self.browser.page:
-                final_screenshot = await self.browser.capture_screen()
-
-            await self.browser.close()
+            # Persist the skill cache while the final screenshot is taken
+            save_task = (asyncio.create_task(self.skill_cache.save_async())
+                         if self.skill_cache is not None else None)
+            try:
+                if self.browser and self.browser.page:
+                    # Reuse the last capture if nothing has touched the page since
+                    final_screenshot = (await self.browser.capture_screen()
+                                        if screen_changed else last_screenshot)
+            except Exception as e:
+                # A crashed page must not keep the browser from going back to the pool
+                logger.warning("Unable to capture the final screenshot: %s", e)
+                final_screenshot = last_screenshot
+            finally:
+                if self.browser_pool is None:
+                    await self.browser.close()
+                elif self.browser is not None:
+                    await self.browser_pool.release(self.browser)
+                    self.browser = None
+
+                if save_task is not None:
+                    await save_task
         
-        return {
+        yield {
+            "type": "final",
             "final_message": final_response,
-            "action_history": action_history,
             "termination_reason": termination_reason,
             "final_screenshot_bytes": final_screenshot
         }
+
+class ComputerUseAgent(SyncWrapper):
+    """Sync facade over AsyncComputerUseAgent, for scripts without an event loop"""
+
+    def __init__(self,
+                 llm_client: GeminiComputerUseClient,
+                 browser_manager: BrowserManager,
+                 max_turns: int = 20,
+                 skill_cache: Optional[SkillCache] = None):
+        # Runs on the browser's loop, playwright objects are bound to the loop they were made in
+        super().__init__(
+            AsyncComputerUseAgent(llm_client=llm_client,
+                                  browser_manager=browser_manager._wrapped,
+                                  max_turns=max_turns,
+                                  skill_cache=skill_cache),
+            loop=browser_manager._loop
+        )
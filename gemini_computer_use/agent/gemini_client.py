@@ -1,12 +1,59 @@
 """Encapsulate LLM (Gemini) interactions."""
-from typing import List, Dict, Any, Optional
+import io
+import time
+import hashlib
+import functools
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncIterator
 from google.genai import Client, types
 
-from .utils import time_logger
+from .utils import get_image_mime_type, time_logger
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Predefined computer use functions the model shouldn't call
+EXCLUDED_FUNCTIONS = (
+    # "drag_and_drop",
+    "open_web_browser",
+)
+
+SAFETY_SETTINGS = (
+    types.SafetySetting(
+        category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+        threshold=types.HarmBlockThreshold.BLOCK_NONE),
+    types.SafetySetting(
+        category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+        threshold=types.HarmBlockThreshold.BLOCK_NONE)
+)
+
+# Uploaded screenshots are reused by content hash, the Files API keeps them for 48 hours
+UPLOAD_REUSE_SECONDS = 24 * 60 * 60
+MAX_REUSED_UPLOADS = 64
+
+@functools.lru_cache(maxsize=16)
+def _build_config(system_instructions: str,
+                  excluded_functions: tuple[str, ...]) -> types.GenerateContentConfig:
+    """Build the generation config, shared by all clients with the same settings"""
+    # NOTE: The returned config is shared, treat it as read only
+    system_instruction = None
+    if system_instructions:
+        system_instruction = types.Content(
+            role="system",
+            parts=[types.Part(text=system_instructions)],
+        )
+    return types.GenerateContentConfig(
+        system_instruction=system_instruction,
+        tools=[types.Tool(
+            computer_use=types.ComputerUse(
+                environment=types.Environment.ENVIRONMENT_BROWSER,
+                # TODO: Hardcoding for now, but should pass in from init
+                excluded_predefined_functions=list(excluded_functions)
+            )
+        )],
+        safety_settings=list(SAFETY_SETTINGS)
+    )
+
 class GeminiComputerUseClient:
     """Gemini client class"""
 
@@ -15,7 +62,9 @@ class GeminiComputerUseClient:
                  vertexai_project: Optional[str] = None,
                  vertexai_location: Optional[str] = None,
                  model_name: str = "gemini-2.5-computer-use-preview-10-2025",
-                 system_instructions: str = ""):
+                 system_instructions: str = "",
+                 max_screenshot_turns: int = 3,
+                 upload_screenshots: bool = False):
         """Initializes a Gemini client instance.
 
         Args:
@@ -24,6 +73,11 @@ class GeminiComputerUseClient:
             vertexai_location: GCP region for Vertex AI usage.
             model_name: Gemini model name.
             system_instructions: Optional system instructions.
+            max_screenshot_turns: Number of most recent function response turns
+                that keep their screenshots, older ones are sent without them.
+            upload_screenshots: Upload each new screenshot once through the Files API
+                and reference it by uri, instead of inlining the bytes in every request.
+                Only available with an API key, the Files API isn't on Vertex AI.
         """
         if api_key:
             logger.info("Using Gemini with API key.")
@@ -32,8 +86,8 @@ class GeminiComputerUseClient:
             )
         elif vertexai_project and vertexai_location:
             logger.info(
-                f"Using Vertex AI endpoints for project: `{vertexai_project}` "
-                f"in location: `{vertexai_location}`."
+                "Using Vertex AI endpoints for project: `%s` in location: `%s`.",
+                vertexai_project, vertexai_location
             )
             self.gemini_client = Client(
                 vertexai=True,
@@ -48,55 +102,19 @@ class GeminiComputerUseClient:
         
         self.model_name = model_name
         self.system_instructions = system_instructions
-        self.excluded_functions = [
-            # "drag_and_drop",
-            "open_web_browser"
-        ]
+        self.max_screenshot_turns = max_screenshot_turns
+        self.upload_screenshots = upload_screenshots
+        # Screenshot digest -> (file uri, reuse deadline), least recently used first
+        self._uploaded_screenshots: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        if upload_screenshots and not api_key:
+            logger.warning("Screenshot uploads need the Files API, sending them inline on Vertex AI.")
+            self.upload_screenshots = False
+        self.excluded_functions = EXCLUDED_FUNCTIONS
         self._setup_config()
 
     def _setup_config(self):
         """Set up the generation config"""
-        if self.system_instructions:
-            system_instructions_contents = types.Content(
-                role="system",
-                parts=[types.Part(text=self.system_instructions)],
-            )
-            self.config = types.GenerateContentConfig(
-                system_instruction=system_instructions_contents,
-                tools=[types.Tool(
-                    computer_use=types.ComputerUse(
-                        environment=types.Environment.ENVIRONMENT_BROWSER,
-                        # TODO: Hardcoding for now, but should pass in from init
-                        excluded_predefined_functions=self.excluded_functions
-                    )
-                )],
-                safety_settings=[
-                    types.SafetySetting(
-                        category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                        threshold=types.HarmBlockThreshold.BLOCK_NONE),
-                    types.SafetySetting(
-                        category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                        threshold=types.HarmBlockThreshold.BLOCK_NONE)
-                ]
-            )
-        else:
-            self.config = types.GenerateContentConfig(
-                tools=[types.Tool(
-                    computer_use=types.ComputerUse(
-                        environment=types.Environment.ENVIRONMENT_BROWSER,
-                        # TODO: Hardcoding for now, but should pass in from init
-                        excluded_predefined_functions=self.excluded_functions
-                    )
-                )],
-                safety_settings=[
-                    types.SafetySetting(
-                        category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                        threshold=types.HarmBlockThreshold.BLOCK_NONE),
-                    types.SafetySetting(
-                        category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                        threshold=types.HarmBlockThreshold.BLOCK_NONE)
-                ]
-            )
+        self.config = _build_config(self.system_instructions, self.excluded_functions)
 
     # TODO: add type hint for initial_image
     def build_initial_message(self, goal: str, initial_image):
@@ -106,8 +124,8 @@ class GeminiComputerUseClient:
                 role="user",
                 parts=[
                     types.Part(text=goal),
-                    # TODO: check mime_type instead of hardcoding here
-                    types.Part.from_bytes(data=initial_image, mime_type="image/png"),
+                    types.Part.from_bytes(data=initial_image,
+                                          mime_type=get_image_mime_type(initial_image)),
                 ],
             )
         ]
@@ -134,36 +152,99 @@ class GeminiComputerUseClient:
 
         return response
 
+    async def generate_content_stream_async(self,
+                                            contents: List[types.Content]) -> AsyncIterator[types.Part]:
+        """Stream response parts from llm as they arrive using aio client"""
+        stream = await self.gemini_client.aio.models.generate_content_stream(
+            model=self.model_name,
+            contents=contents,
+            config=self.config
+        )
+        async for chunk in stream:
+            if not chunk.candidates or not chunk.candidates[0].content:
+                continue
+            for part in chunk.candidates[0].content.parts or []:
+                yield part
+
+    async def upload_screenshot_async(self, screenshot: bytes) -> str:
+        """Upload a screenshot through the Files API and get its uri.
+
+        Identical screenshots uploaded recently are not sent again, their uri is reused.
+        """
+        digest = hashlib.blake2b(screenshot, digest_size=16).digest()
+        cached = self._uploaded_screenshots.get(digest)
+        if cached is not None and cached[1] > time.monotonic():
+            self._uploaded_screenshots.move_to_end(digest)
+            return cached[0]
+
+        uploaded = await self.gemini_client.aio.files.upload(
+            file=io.BytesIO(screenshot),
+            config=types.UploadFileConfig(mime_type=get_image_mime_type(screenshot))
+        )
+        self._uploaded_screenshots[digest] = (
+            uploaded.uri, time.monotonic() + UPLOAD_REUSE_SECONDS
+        )
+        self._uploaded_screenshots.move_to_end(digest)
+        if len(self._uploaded_screenshots) > MAX_REUSED_UPLOADS:
+            self._uploaded_screenshots.popitem(last=False)
+        return uploaded.uri
+
     # TODO: add type hint for screenshot
     def build_function_responses_message(self,
                                          screenshot,
                                          current_url: str,
-                                         results: List[tuple[str, Dict[str, Any]]]) -> types.Content:
-        """Build the functions response for each run in the loop"""
-        function_responses = []
-        for name, result in results:
-            response_data = {"url": current_url}
-            response_data.update(result)
-            function_responses.append(
-                types.FunctionResponse(
-                    name=name,
-                    response=response_data,
-                    parts=[
-                        types.FunctionResponsePart(
-                            inline_data=types.FunctionResponseBlob(
-                                # TODO: check mime_type instead of hardcoding here
-                                mime_type="image/png",
-                                data=screenshot
-                            )
-                        )
-                    ]
-                )
-            )
-        
+                                         results: List[tuple[str, Dict[str, Any]]],
+                                         screenshot_uri: Optional[str] = None) -> types.Content:
+        """Build the functions response for each run in the loop.
+
+        The screenshot is referenced by `screenshot_uri` if it was uploaded,
+        otherwise its bytes are sent inline.
+        """
+        # Same screenshot for every result, wrap and validate it once
+        screenshot_part = self._screenshot_part(screenshot, screenshot_uri)
         return types.Content(
             role="user",
             parts=[
-                types.Part(function_response=function_response)
-                for function_response in function_responses
+                types.Part(function_response=types.FunctionResponse(
+                    name=name,
+                    response={"url": current_url, **result},
+                    parts=[screenshot_part]
+                ))
+                for name, result in results
             ]
         )
+
+    def _screenshot_part(self,
+                         screenshot: bytes,
+                         screenshot_uri: Optional[str] = None) -> types.FunctionResponsePart:
+        """Wrap the screenshot for a function response, by uri if it was uploaded"""
+        if screenshot_uri:
+            return types.FunctionResponsePart(
+                file_data=types.FunctionResponseFileData(
+                    mime_type=get_image_mime_type(screenshot),
+                    file_uri=screenshot_uri
+                )
+            )
+        return types.FunctionResponsePart(
+            inline_data=types.FunctionResponseBlob(
+                mime_type=get_image_mime_type(screenshot),
+                data=screenshot
+            )
+        )
+
+    def trim_screenshot_history(self, contents: List[types.Content]):
+        """Drop screenshots from function responses older than the last few turns"""
+        screenshot_turns = 0
+        for content in reversed(contents):
+            if content.role != "user" or not content.parts:
+                continue
+            responses = [
+                p.function_response for p in content.parts
+                if p.function_response and p.function_response.parts
+            ]
+            if not responses:
+                continue
+            screenshot_turns += 1
+            if screenshot_turns > self.max_screenshot_turns:
+                for function_response in responses:
+                    function_response.parts = None
@@ -1,11 +1,26 @@
 """Common logger"""
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Records are written to stderr by a background listener thread,
+# so logging on the agent's hot path never blocks on I/O
+_log_queue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter(
+    fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+))
+_listener = QueueListener(_log_queue, _stream_handler, respect_handler_level=True)
+_listener.start()
+# Flush whatever is still queued on exit
+atexit.register(_listener.stop)
 
 # Configure logging once, globally
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
+    handlers=[QueueHandler(_log_queue)]
 )
 
 def get_logger(name: str):
@@ -0,0 +1,96 @@
+"""Memoize model action turns to skip repeated llm round trips."""
+import os
+import pickle
+import asyncio
+import tempfile
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Tuple, Dict, Any
+from urllib.parse import urlsplit, urlunsplit
+
+from google.genai import types
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+SkillKey = Tuple[str, str]
+
+def strip_url_querystring(url: str) -> str:
+    """Drop the query string and fragment from the url"""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+class SkillCache:
+    """LRU cache mapping (page, goal + last action + screen) to the model's function call turn"""
+
+    def __init__(self, max_size: int = 100, path: Optional[str] = None):
+        """Initializes the skill cache.
+
+        Args:
+            max_size: Maximum number of cached turns, least recently used are evicted.
+            path: Optional pickle file to warm the cache from and persist it to.
+                Only point this at files written by this cache.
+        """
+        self.max_size = max_size
+        self.path = path
+        self._entries: OrderedDict[SkillKey, types.Content] = OrderedDict()
+
+        if self.path and os.path.exists(self.path):
+            self.load()
+
+    @staticmethod
+    def make_key(current_url: str,
+                 goal: str,
+                 last_action_name: str,
+                 last_action_args: Dict[str, Any],
+                 screenshot: bytes) -> SkillKey:
+        """Build the cache key for the next turn, the screenshot ties it to the page state"""
+        action_description = f"{goal}|{last_action_name}|{sorted(last_action_args.items())}"
+        digest = hashlib.sha1(action_description.encode("utf-8"))
+        digest.update(screenshot)
+        return strip_url_querystring(current_url), digest.hexdigest()
+
+    def get(self, key: SkillKey) -> Optional[types.Content]:
+        """Get the cached model turn, marking it as recently used"""
+        content = self._entries.get(key)
+        if content is not None:
+            self._entries.move_to_end(key)
+        return content
+
+    def put(self, key: SkillKey, content: types.Content):
+        """Cache a model turn, evicting the least recently used one on overflow"""
+        self._entries[key] = content
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def load(self):
+        """Warm the cache from disk"""
+        try:
+            with open(self.path, "rb") as f:
+                self._entries = OrderedDict(pickle.load(f))
+            logger.info("Loaded %s cached skills from %s", len(self._entries), self.path)
+        except Exception as e:
+            logger.warning("Unable to load skill cache from %s: %s", self.path, e)
+
+    def save(self):
+        """Persist the cache to disk, if a path was provided"""
+        if self.path:
+            self._write(list(self._entries.items()))
+
+    async def save_async(self):
+        """Persist the cache to disk from a worker thread, if a path was provided"""
+        if self.path:
+            # Snapshot on the loop thread, other runs may keep updating the cache
+            await asyncio.to_thread(self._write, list(self._entries.items()))
+
+    def _write(self, entries):
+        """Write the entries through a temp file, so concurrent saves never leave a partial file"""
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as f:
+                pickle.dump(entries, f)
+            os.replace(f.name, self.path)
+        except Exception as e:
+            logger.warning("Unable to save skill cache to %s: %s", self.path, e)
@@ -6,6 +6,13 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from api import routes
+from agent.config import (GEMINI_API_KEY, USE_VERTEXAI, VERTEXAI_PROJECT_ID, VERTEXAI_LOCATION,
+                          MODEL_NAME, MAX_SCREENSHOT_TURNS, UPLOAD_SCREENSHOTS,
+                          SCREEN_WIDTH, SCREEN_HEIGHT,
+                          BLOCK_RESOURCES, SCREENSHOT_FORMAT, SCREENSHOT_QUALITY,
+                          BROWSER_POOL_SIZE)
+from agent.browser import BrowserPool
+from agent.gemini_client import GeminiComputerUseClient
 from agent.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,8 +21,31 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI):
     """Lifespan handler for a fastapi service"""
     logger.info("Starting Gemini Computer Use API...")
+    # One client for all requests, so http connections and auth tokens are reused
+    if not USE_VERTEXAI:
+        app.state.llm = GeminiComputerUseClient(api_key=GEMINI_API_KEY,
+                                                model_name=MODEL_NAME,
+                                                max_screenshot_turns=MAX_SCREENSHOT_TURNS,
+                                                upload_screenshots=UPLOAD_SCREENSHOTS)
+    else:
+        app.state.llm = GeminiComputerUseClient(vertexai_project=VERTEXAI_PROJECT_ID,
+                                                vertexai_location=VERTEXAI_LOCATION,
+                                                model_name=MODEL_NAME,
+                                                max_screenshot_turns=MAX_SCREENSHOT_TURNS)
+    # Keep browsers warm across requests instead of launching one per run
+    app.state.browser_pool = await BrowserPool(
+        size=BROWSER_POOL_SIZE,
+        page_width=SCREEN_WIDTH,
+        page_height=SCREEN_HEIGHT,
+        # Read this based on env, for containers, read the respective variable
+        headless=True,
+        block_resources=BLOCK_RESOURCES,
+        screenshot_format=SCREENSHOT_FORMAT,
+        screenshot_quality=SCREENSHOT_QUALITY,
+    ).start()
     yield
     logger.info("Shutting down Gemini Computer Use API...")
+    await app.state.browser_pool.close()
 
 app = FastAPI(
     title="Gemini Computer Use Agent API",
@@ -44,7 +74,7 @@ async def add_process_time_header(request: Request, call_next):
     process_time = time.perf_counter() - start_time
     
     response.headers["X-Process-Time"] = f"{process_time:.3f}"
-    logger.info(f"{request.method} {request.url.path} processed in {process_time:.3f}s")
+    logger.info("%s %s processed in %.3fs", request.method, request.url.path, process_time)
     
     return response
 
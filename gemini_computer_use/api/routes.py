@@ -1,22 +1,33 @@
 """API routes for Gemini Computer Use Agent"""
 from typing import Optional, List, Dict, Any, Literal
 
-import base64
-from fastapi import APIRouter, HTTPException
+import json
+import asyncio
+from contextlib import aclosing
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from pydantic.config import ConfigDict
 
-from agent.config import (GEMINI_API_KEY, USE_VERTEXAI, VERTEXAI_PROJECT_ID, VERTEXAI_LOCATION,
-                          MODEL_NAME, SCREEN_WIDTH, SCREEN_HEIGHT, MAX_AGENT_TURNS)
-from agent.browser import AsyncBrowserManager
-from agent.gemini_client import GeminiComputerUseClient
+from agent.config import (MAX_AGENT_TURNS, SKILL_CACHE, SKILL_CACHE_PATH, SKILL_CACHE_SIZE,
+                          STREAM_RESPONSES)
 from agent.core import AsyncComputerUseAgent
+from agent.skill_cache import SkillCache
 from agent.logger import get_logger
 
+try:
+    # SIMD accelerated, same api as the stdlib module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 logger = get_logger(__name__)
 
 router = APIRouter(tags=["Gemini Agent"])
 
+# Shared across requests so runs warm the cache for each other
+skill_cache = SkillCache(SKILL_CACHE_SIZE, SKILL_CACHE_PATH) if SKILL_CACHE else None
+
 class AgentRunRequest(BaseModel):
     """Request data model for Agent Run Request"""
     goal: str
@@ -39,49 +50,91 @@ class AgentRunResponse(BaseModel):
     action_history: List[Dict[str, Any]]
     final_screenshot: Optional[str] = None
 
-@router.post("/run_agent_async", response_model=AgentRunResponse)
-async def run_agent_async(req: AgentRunRequest):
-    """Runs the Gemini Computer Use Agent with the given goal asynchronously"""
+def _encode_screenshot(screenshot: bytes) -> str:
+    """Base64 encode the screenshot for the json response"""
+    return base64.b64encode(screenshot).decode("ascii")
 
-    try:
-        browser = AsyncBrowserManager(
-            page_width=SCREEN_WIDTH,
-            page_height=SCREEN_HEIGHT,
-            # Read this based on env, for containers, read the respective variable
-            headless=True,
-        )
+def _build_agent(req: AgentRunRequest, request: Request) -> AsyncComputerUseAgent:
+    """Build an agent sharing the app's llm client and browser pool"""
+    return AsyncComputerUseAgent(
+        llm_client=request.app.state.llm,
+        browser_pool=request.app.state.browser_pool,
+        max_turns=req.max_turns,
+        skill_cache=skill_cache,
+        stream_responses=STREAM_RESPONSES,
+    )
 
-        if not USE_VERTEXAI:
-            llm = GeminiComputerUseClient(api_key=GEMINI_API_KEY,
-                                          model_name=MODEL_NAME)
-        else:
-            llm = GeminiComputerUseClient(vertexai_project=VERTEXAI_PROJECT_ID,
-                                          vertexai_location=VERTEXAI_LOCATION,
-                                          model_name=MODEL_NAME)
-
-        agent = AsyncComputerUseAgent(
-            llm_client=llm,
-            browser_manager=browser,
-            max_turns=req.max_turns,
-        )
+async def _run_agent(req: AgentRunRequest, request: Request) -> AgentRunResponse:
+    """Runs a single agent with a browser from the pool and builds its response"""
+    agent = _build_agent(req, request)
 
-        result_dict = await agent.run(goal=req.goal, initial_url=req.url)
+    result_dict = await agent.run(goal=req.goal, initial_url=req.url)
 
-        screenshot_b64 = None
+    screenshot_b64 = None
 
-        if result_dict.get("final_screenshot_bytes"):
-            screenshot_b64 = base64.b64encode(result_dict["final_screenshot_bytes"]).decode('utf-8')
+    if result_dict.get("final_screenshot_bytes"):
+        # Encode in a worker thread so other runs on the loop aren't blocked
+        screenshot_b64 = await asyncio.to_thread(
+            _encode_screenshot, result_dict["final_screenshot_bytes"]
+        )
 
-        is_success = result_dict["termination_reason"] == "COMPLETED"
+    is_success = result_dict["termination_reason"] == "COMPLETED"
 
-        return AgentRunResponse(
-            success=is_success,
-            termination_reason=result_dict["termination_reason"],
-            message=result_dict["final_message"],
-            action_history=result_dict["action_history"],
-            final_screenshot=screenshot_b64,
-        )
+    return AgentRunResponse(
+        success=is_success,
+        termination_reason=result_dict["termination_reason"],
+        message=result_dict["final_message"],
+        action_history=result_dict["action_history"],
+        final_screenshot=screenshot_b64,
+    )
+
+@router.post("/run_agent_async", response_model=AgentRunResponse)
+async def run_agent_async(req: AgentRunRequest, request: Request):
+    """Runs the Gemini Computer Use Agent with the given goal asynchronously"""
+
+    try:
+        return await _run_agent(req, request)
 
     except Exception as e:
         logger.error(f"Agent execution failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="An internal server error occurred.")
+
+@router.post("/run_agent_batch", response_model=List[AgentRunResponse])
+async def run_agent_batch(reqs: List[AgentRunRequest], request: Request):
+    """Runs the agent for each goal concurrently, at most one run per pooled browser"""
+
+    # Each run waits for a free browser, so the pool size bounds the concurrency
+    results = await asyncio.gather(
+        *[_run_agent(req, request) for req in reqs],
+        return_exceptions=True
+    )
+
+    responses = []
+    for req, result in zip(reqs, results):
+        if isinstance(result, BaseException):
+            logger.error("Agent execution failed for goal `%s`: %s", req.goal, result,
+                         exc_info=result)
+            result = AgentRunResponse(success=False,
+                                      message="An internal server error occurred.",
+                                      action_history=[])
+        responses.append(result)
+    return responses
+
+@router.post("/run_agent_stream")
+async def run_agent_stream(req: AgentRunRequest, request: Request):
+    """Runs the agent, streaming each action and the final result as server sent events"""
+    agent = _build_agent(req, request)
+
+    async def event_stream():
+        # Closing the generator on disconnect still releases the browser
+        async with aclosing(agent.run_iter(goal=req.goal, initial_url=req.url)) as events:
+            async for event in events:
+                if event["type"] == "final":
+                    screenshot = event.pop("final_screenshot_bytes")
+                    event["final_screenshot"] = (
+                        await asyncio.to_thread(_encode_screenshot, screenshot)
+                        if screenshot else None
+                    )
+                yield f"data: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
@@ -3,17 +3,15 @@ import argparse
 import sys
 import asyncio
 
-from agent.config import (GEMINI_API_KEY, USE_VERTEXAI, VERTEXAI_PROJECT_ID, VERTEXAI_LOCATION,
-                          MODEL_NAME, INITIAL_URL, SCREEN_WIDTH, SCREEN_HEIGHT, MAX_AGENT_TURNS)
-from agent.browser import BrowserManager, AsyncBrowserManager
-from agent.gemini_client import GeminiComputerUseClient
-from agent.core import ComputerUseAgent, AsyncComputerUseAgent
 from agent.logger import get_logger
 
 logger = get_logger(__name__)
 
-def run_agent_sync():
-    """Runs the computer agent using CLI synchronously"""
+# NOTE: The agent modules are imported inside the entry points, after the arguments
+# are parsed, so `--help` and usage errors don't pay for importing playwright and genai
+
+def _parse_cli() -> argparse.Namespace:
+    """Parse the CLI arguments shared by both entry points"""
     parser = argparse.ArgumentParser(description="Run the Gemini Computer Use Agent.")
     parser.add_argument("--goal", type=str, help="The goal description for the agent.")
     parser.add_argument("--initial_url", type=str, default=None, help="Initial URL to open (optional)")
@@ -22,25 +20,64 @@ def run_agent_sync():
     if not args.goal:
         logger.error("Goal argument missing.")
         sys.exit(1)
+    return args
+
+def _build_llm():
+    """Build the Gemini client from the config"""
+    from agent import config
+    from agent.gemini_client import GeminiComputerUseClient
+
+    if not config.USE_VERTEXAI:
+        return GeminiComputerUseClient(api_key=config.GEMINI_API_KEY,
+                                       model_name=config.MODEL_NAME,
+                                       max_screenshot_turns=config.MAX_SCREENSHOT_TURNS,
+                                       upload_screenshots=config.UPLOAD_SCREENSHOTS)
+    return GeminiComputerUseClient(vertexai_project=config.VERTEXAI_PROJECT_ID,
+                                   vertexai_location=config.VERTEXAI_LOCATION,
+                                   model_name=config.MODEL_NAME,
+                                   max_screenshot_turns=config.MAX_SCREENSHOT_TURNS)
+
+def _browser_kwargs() -> dict:
+    """Browser manager arguments from the config, shared by both entry points"""
+    from agent import config
+
+    return {
+        "page_width": config.SCREEN_WIDTH,
+        "page_height": config.SCREEN_HEIGHT,
+        "headless": False,
+        "block_resources": config.BLOCK_RESOURCES,
+        "screenshot_format": config.SCREENSHOT_FORMAT,
+        "screenshot_quality": config.SCREENSHOT_QUALITY,
+        "user_data_dir": config.USER_DATA_DIR,
+        "storage_state": config.STORAGE_STATE,
+    }
+
+def _build_skill_cache():
+    """Build the skill cache if enabled in the config"""
+    from agent import config
+    from agent.skill_cache import SkillCache
+
+    if not config.SKILL_CACHE:
+        return None
+    return SkillCache(config.SKILL_CACHE_SIZE, config.SKILL_CACHE_PATH)
+
+def run_agent_sync():
+    """Runs the computer agent using CLI synchronously"""
+    args = _parse_cli()
 
     try:
-        browser = BrowserManager(page_width=SCREEN_WIDTH,
-                                 page_height=SCREEN_HEIGHT,
-                                 headless=False)
-
-        if not USE_VERTEXAI:
-            llm = GeminiComputerUseClient(api_key=GEMINI_API_KEY,
-                                          model_name=MODEL_NAME)
-        else:
-            llm = GeminiComputerUseClient(vertexai_project=VERTEXAI_PROJECT_ID,
-                                          vertexai_location=VERTEXAI_LOCATION,
-                                          model_name=MODEL_NAME)
-
-        agent = ComputerUseAgent(llm_client=llm,
+        from agent import config
+        from agent.browser import BrowserManager
+        from agent.core import ComputerUseAgent
+
+        browser = BrowserManager(**_browser_kwargs())
+
+        agent = ComputerUseAgent(llm_client=_build_llm(),
                                  browser_manager=browser,
-                                 max_turns=MAX_AGENT_TURNS)
+                                 max_turns=config.MAX_AGENT_TURNS,
+                                 skill_cache=_build_skill_cache())
 
-        agent.run(goal=args.goal, initial_url=args.initial_url or INITIAL_URL)
+        agent.run(goal=args.goal, initial_url=args.initial_url or config.INITIAL_URL)
 
     except Exception as e:
         logger.error(f"Agent terminated due to exception: {e}", exc_info=True)
@@ -48,33 +85,22 @@ def run_agent_sync():
 
 async def run_agent_async():
     """Runs the computer agent using CLI asynchronously"""
-    parser = argparse.ArgumentParser(description="Run the Gemini Computer Use Agent.")
-    parser.add_argument("--goal", type=str, help="The goal description for the agent.")
-    parser.add_argument("--initial_url", type=str, default=None, help="Initial URL to open (optional)")
-    args = parser.parse_args()
-
-    if not args.goal:
-        logger.error("Goal argument missing.")
-        sys.exit(1)
+    args = _parse_cli()
 
     try:
-        browser = AsyncBrowserManager(page_width=SCREEN_WIDTH,
-                                      page_height=SCREEN_HEIGHT,
-                                      headless=False)
-
-        if not USE_VERTEXAI:
-            llm = GeminiComputerUseClient(api_key=GEMINI_API_KEY,
-                                          model_name=MODEL_NAME)
-        else:
-            llm = GeminiComputerUseClient(vertexai_project=VERTEXAI_PROJECT_ID,
-                                          vertexai_location=VERTEXAI_LOCATION,
-                                          model_name=MODEL_NAME)
-
-        agent = AsyncComputerUseAgent(llm_client=llm,
+        from agent import config
+        from agent.browser import AsyncBrowserManager
+        from agent.core import AsyncComputerUseAgent
+
+        browser = AsyncBrowserManager(**_browser_kwargs())
+
+        agent = AsyncComputerUseAgent(llm_client=_build_llm(),
                                       browser_manager=browser,
-                                      max_turns=MAX_AGENT_TURNS)
+                                      max_turns=config.MAX_AGENT_TURNS,
+                                      skill_cache=_build_skill_cache(),
+                                      stream_responses=config.STREAM_RESPONSES)
 
-        await agent.run(goal=args.goal, initial_url=args.initial_url or INITIAL_URL)
+        await agent.run(goal=args.goal, initial_url=args.initial_url or config.INITIAL_URL)
 
     except Exception as e:
         logger.error(f"Agent terminated due to exception: {e}", exc_info=True)
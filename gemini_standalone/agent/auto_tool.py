@@ -1,7 +1,9 @@
 """Module that handles auto function declaration generation for python functions"""
 import inspect
+import functools
 from enum import Enum
-from typing import get_type_hints, Optional, Union, get_args, get_origin, Annotated
+from types import MappingProxyType
+from typing import get_type_hints, Any, Optional, Union, get_args, get_origin, Annotated
 
 class OpenAPITypes(Enum):
     """The basic data types defined by OpenAPI 3.0"""
@@ -15,37 +17,50 @@ class OpenAPITypes(Enum):
     OBJECT = "object"
     ARRAY = "array"
 
-# Mapping Python types to Open API types
+# Mapping Python types to Open API type names
 PYTHON_TO_OPENAPI_TYPE_MAP = {
-    str: OpenAPITypes.STRING,
-    int:  OpenAPITypes.INTEGER,
-    float:  OpenAPITypes.NUMBER,
-    bool:  OpenAPITypes.BOOLEAN,
-    dict:  OpenAPITypes.OBJECT,
-    list:  OpenAPITypes.ARRAY,
+    str: OpenAPITypes.STRING.value,
+    int:  OpenAPITypes.INTEGER.value,
+    float:  OpenAPITypes.NUMBER.value,
+    bool:  OpenAPITypes.BOOLEAN.value,
+    dict:  OpenAPITypes.OBJECT.value,
+    list:  OpenAPITypes.ARRAY.value,
+    tuple:  OpenAPITypes.ARRAY.value,
+    set:  OpenAPITypes.ARRAY.value,
+    frozenset:  OpenAPITypes.ARRAY.value,
 }
 
 class Schema:
     """Defines the schema for a function's parameters or return value.
     This aligns with OpenAPI schema.
     """
-    def __init__(self, arg_type: OpenAPITypes, properties: Optional[dict] = None,
+    __slots__ = ("arg_type", "properties", "required", "description",
+                 "items", "enum", "default", "_oas_dict")
+
+    def __init__(self, arg_type: OpenAPITypes | str, properties: Optional[dict] = None,
                  required: Optional[list[str]] = None, description: Optional[str] = None,
                  items: Optional['Schema'] = None,
                  enum: Optional[list[str]] = None,
                  default: Optional[any] = None):
-        self.arg_type = arg_type
-        self.properties = properties if properties is not None else {}
-        self.required = required if required is not None else []
+        # Stored as the plain type name, the enum only validates it
+        self.arg_type = OpenAPITypes(arg_type).value
+        # Left as None for leaf schemas, which never use them
+        self.properties = properties
+        self.required = required
         self.description = description
         self.items = items      # For array types
         self.enum = enum        # For enum types
         self.default = default
+        self._oas_dict = None
 
     def oas_format(self):
-        """Converts the Schema object to a dictionary for API consumption."""
+        """Converts the Schema object to a dictionary for API consumption.
+        Built on the first call, treat the returned dict as read only.
+        """
+        if self._oas_dict is not None:
+            return self._oas_dict
         schema_dict = {
-            "type": self.arg_type.value,
+            "type": self.arg_type,
         }
         if self.description:
             schema_dict["description"] = self.description
@@ -63,113 +78,176 @@ class Schema:
                 schema_dict["default"] = self.default.value
             else:
                 schema_dict["default"] = self.default
+        self._oas_dict = schema_dict
         return schema_dict
 
+
 class FunctionDeclaration:
     """Represents a function's declaration suitable for llm consumption."""
-    def __init__(self, name: str, description: str, parameters: Schema):
+    __slots__ = ("name", "description", "parameters")
+
+    def __init__(self, name: str, description: str, parameters: Schema | dict):
         self.name = name
         self.description = description
+        # Either a Schema or its already built OpenAPI dict
         self.parameters = parameters
 
     def oas_format(self) -> dict:
         """Converts the FunctionDeclaration object to a dictionary."""
+        parameters = self.parameters
         return {
             "name": self.name,
             "description": self.description,
-            "parameters": self.parameters.oas_format()
+            "parameters": parameters.oas_format() if isinstance(parameters, Schema) else parameters
+        }
+
+# Generic origins serialized as arrays of their first type argument, or objects
+ARRAY_ORIGINS = frozenset({list, tuple, set, frozenset})
+OBJECT_ORIGINS = frozenset({dict})
+
+def _copy_schema_dict(schema_dict: dict) -> dict:
+    """Copy a schema dict along with its nested dicts and lists"""
+    return {
+        key: (_copy_schema_dict(value) if isinstance(value, dict)
+              else list(value) if isinstance(value, list) else value)
+        for key, value in schema_dict.items()
+    }
+
+# Parameter types repeat across tools, so their schemas are built once and cached.
+# Callers get their own copy, the cached templates are never handed out.
+def _type_schema_dict(py_type: type) -> dict:
+    """Gets the OpenAPI schema dict for a type hint, cached when the hint is hashable."""
+    try:
+        return _copy_schema_dict(_cached_type_schema_dict(py_type))
+    except TypeError:
+        # Unhashable Annotated metadata (e.g. a dict) can't be a cache key
+        return _build_type_schema_dict(py_type)
+
+def _build_type_schema_dict(py_type: type) -> dict:
+    """Recursively creates the OpenAPI schema dict from a Python type hint."""
+    origin = get_origin(py_type)
+    args = get_args(py_type)
+
+    # Handle Annotated[type, "description"], also when nested like Optional[Annotated[...]]
+    if origin is Annotated:
+        # Unpack the annotated type and its description
+        schema_dict = _type_schema_dict(args[0])
+        if isinstance(args[1], str) and args[1]:
+            schema_dict["description"] = args[1]
+        return schema_dict
+
+    # Handle list[type], tuple[type, ...], set[type]
+    if origin in ARRAY_ORIGINS:
+        # Get the inner type, default to 'str' if not specified (like just 'list')
+        inner_type = args[0] if args else str
+        return {
+            "type": OpenAPITypes.ARRAY.value,
+            "items": _type_schema_dict(inner_type)
+        }
+
+    # Handle dict[key, value]
+    # NOTE: Value types aren't declared, additionalProperties isn't accepted by the Gemini schema
+    if origin in OBJECT_ORIGINS:
+        return {"type": OpenAPITypes.OBJECT.value}
+
+    # Handle Optional[type] or Union[type, None]
+    if origin is Union:
+        # Filter out NoneType to find the actual type
+        args = [arg for arg in args if arg is not type(None)]
+        if args:
+            # Recurse with the actual type
+            return _type_schema_dict(args[0])
+
+    # Handle Enums
+    # Use issubclass() and check that it's not the base Enum class itself
+    if inspect.isclass(py_type) and issubclass(py_type, Enum):
+        # Assuming enum values are strings, which is common.
+        # NOTE: You could add logic here to check the type of enum values.
+        return {
+            "type": OpenAPITypes.STRING.value,
+            "enum": [member.value for member in py_type]
         }
 
+    # Handle basic types
+    return {"type": PYTHON_TO_OPENAPI_TYPE_MAP.get(py_type, OpenAPITypes.STRING.value)}
+
+_cached_type_schema_dict = functools.lru_cache(maxsize=512)(_build_type_schema_dict)
+
+def _named_parameters(func) -> list[tuple[str, Any]]:
+    """Get a function's named parameters with their defaults, `inspect.Parameter.empty` if none.
+    *args and **kwargs are left out.
+    """
+    code = getattr(func, "__code__", None)
+    if code is None or hasattr(func, "__wrapped__"):
+        # Not a plain function, its code may not match the signature it exposes
+        return [(name, param.default)
+                for name, param in inspect.signature(func).parameters.items()
+                if param.kind not in (inspect.Parameter.VAR_POSITIONAL,
+                                      inspect.Parameter.VAR_KEYWORD)]
+
+    # Read straight from the code object, avoids building the Signature and Parameters
+    # co_varnames lists the positional parameters first, then the keyword only ones
+    num_positional = code.co_argcount
+    names = code.co_varnames[:num_positional + code.co_kwonlyargcount]
+    defaults = func.__defaults__ or ()
+    kwdefaults = func.__kwdefaults__ or {}
+    first_default = num_positional - len(defaults)
+    return [
+        (name, defaults[i - first_default] if first_default <= i < num_positional
+         else kwdefaults.get(name, inspect.Parameter.empty))
+        for i, name in enumerate(names)
+    ]
+
 class FunctionSchemaBuilder:
-    """Builds a Schema object for a given Python function's parameters."""
+    """Builds the OpenAPI schema dict for a given Python function's parameters."""
     def __init__(self, func):
         self._func = func
-        self._signature = inspect.signature(func)
+        self._parameters = _named_parameters(func)
         # include_extras allows to see Annotated
         self._type_hints = get_type_hints(func, include_extras=True)
-        self.properties: dict[str, Schema] = {}
+        self.properties: dict[str, dict] = {}
         self.required: list[str] = []
         self._process_parameters()
 
-    def _create_schema_from_type(self, py_type: type) -> Schema:
-        """Recursively creates a Schema object from a Python type hint."""
-        # Handle list[type]
-        if get_origin(py_type) in (list, list, tuple):
-            # Get the inner type, default to 'str' if not specified (like just 'list')
-            inner_type = get_args(py_type)[0] if get_args(py_type) else str
-            return Schema(
-                arg_type=OpenAPITypes.ARRAY,
-                items=self._create_schema_from_type(inner_type)
-            )
-
-        # Handle Optional[type] or Union[type, None]
-        if get_origin(py_type) is Union:
-            # Filter out NoneType to find the actual type
-            args = [arg for arg in get_args(py_type) if arg is not type(None)]
-            if args:
-                # Recurse with the actual type
-                return self._create_schema_from_type(args[0])
-
-        # Handle Enums
-        # Use issubclass() and check that it's not the base Enum class itself
-        if inspect.isclass(py_type) and issubclass(py_type, Enum):
-            # Assuming enum values are strings, which is common.
-            # NOTE: You could add logic here to check the type of enum values.
-            return Schema(
-                arg_type=OpenAPITypes.STRING,
-                enum=[member.value for member in py_type]
-            )
-
-        # Handle basic types
-        openapi_type = PYTHON_TO_OPENAPI_TYPE_MAP.get(py_type, OpenAPITypes.STRING)
-        return Schema(arg_type=openapi_type)
-
     def _process_parameters(self):
         """Analyzes function parameters to build properties and required lists."""
-        for name, param in self._signature.parameters.items():
+        for name, default in self._parameters:
             if name == "self":  # Skip 'self' for methods
                 continue
-            if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD): # Skip args and kwargs
-                continue
 
             py_type = self._type_hints.get(name, str) # Default to str if no hint
-            # FIXME: Should remove the default description.
-            description = f"Parameter '{name}'." # Default description
-
-            # Handle Annotated[type, "description"]
-            actual_type = py_type
-            if get_origin(py_type) is Annotated:
-                # Unpack the annotated type and its description
-                actual_type, description_annotation = get_args(py_type)
-                description = description_annotation
 
-            # Create the base schema from the actual type
-            param_schema = self._create_schema_from_type(actual_type)
-
-            # Add the description we found
-            param_schema.description = description
+            # Own copy of the base schema, with the Annotated description if there is one
+            param_schema = _type_schema_dict(py_type)
+            # FIXME: Should remove the default description.
+            param_schema.setdefault("description", f"Parameter '{name}'.")
 
             # Add default value if it exists
-            if param.default is not inspect.Parameter.empty:
-                param_schema.default = param.default
+            if default is not inspect.Parameter.empty:
+                # We need to handle non-serializable defaults like Enums
+                if default is not None:
+                    param_schema["default"] = default.value if isinstance(default, Enum) else default
             else:
                 # A parameter is required ONLY if it has no default value.
                 self.required.append(name)
 
             self.properties[name] = param_schema
 
-    def build(self) -> Schema:
-        """Returns the constructed Schema object for the function's parameters."""
-        return Schema(
-            arg_type=OpenAPITypes.OBJECT,
-            properties=self.properties,
-            required=self.required
-        )
+    def build(self) -> dict:
+        """Returns the schema dict for the function's parameters."""
+        schema_dict = {"type": OpenAPITypes.OBJECT.value}
+        if self.properties:
+            schema_dict["properties"] = self.properties
+        if self.required:
+            schema_dict["required"] = self.required
+        return schema_dict
 
 class FunctionTool:
     """A class to simplify the creation of function declaration objects
     from python functions.
     """
+    __slots__ = ("_func", "name", "description", "parameters_schema")
+
     def __init__(self, func):
         self._func = func
         self.name = func.__name__
@@ -188,5 +266,6 @@ def function_tool(func):
     """Decorator to attach FunctionTool metadata to a function,
     making it easy to generate its FunctionDeclaration.
     """
-    func.tool_metadata = FunctionTool(func).to_declaration().oas_format
+    # Built once and frozen, the declaration dict is shared by every client using the tool
+    func.tool_metadata = MappingProxyType(FunctionTool(func).to_declaration().oas_format())
     return func
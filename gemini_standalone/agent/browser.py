@@ -1,326 +1,200 @@
 """Handle Playwright browser lifecycle and page interactions."""
-import time
 import asyncio
+import inspect
+import weakref
+import functools
 from typing import Optional, Dict, Any
-from playwright.sync_api import sync_playwright
 from playwright.async_api import async_playwright
 
 from .auto_tool import function_tool
-from .utils import denormalize_x, denormalize_y, time_logger
+from .sync_wrapper import SyncWrapper
+from .utils import denormalize, time_logger
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
-class BrowserManager:
-    """Manages all interactions with playwright browser"""
-
-    def __init__(self,
-                 page_width: int = 1440,
-                 page_height: int = 900,
-                 headless: bool = True):
-        
-        self.width = page_width
-        self.height = page_height
-        self.headless_mode = headless
-
-        self.playwright = None
-        self.browser = None
-        self.context = None
-        self.page = None
-
-        self.actions_map = {
-            "open_web_browser": self.open_web_browser,
-            "wait_5_seconds": self.wait_5_seconds,
-            "go_back": self.go_back,
-            "go_forward": self.go_forward,
-            "search": self.search,
-            "navigate": self.navigate,
-            "click_at": self.click_at,
-            "hover_at": self.hover_at,
-            "type_text_at": self.type_text_at,
-            "key_combination": self.key_combination,
-            "scroll_document": self.scroll_document,
-            "scroll_at": self.scroll_at,
-            "drag_and_drop": self.drag_and_drop
-        }
-    
-    def start(self):
-        """Start playwright and create a browser page"""
-        logger.info(
-            "Starting Playwright browser in "
-            f"{'headless' if self.headless_mode else 'browser'} mode..."
-        )
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=self.headless_mode)
-        self.context = self.browser.new_context(
-            viewport={"width": self.width, "height": self.height}
-        )
-        self.page = self.context.new_page()
-        logger.info("BrowserManager initialized successfully.")
-        return self
-    
-    def close(self):
-        """Close browser and stop playwright"""
-        logger.info("Closing browser and cleaning up resources...")
-        try:
-            if self.browser:
-                self.browser.close()
-            if self.playwright:
-                self.playwright.stop()
-        except Exception as e:
-            logger.warning(f"Error during browser close: {e}")
-            raise
-        finally:
-            self.browser = None
-            self.context = None
-            self.page = None
-            self.playwright = None
-            logger.info("Browser closed successfully.")
-    
-    def goto(self, url: str):
-        """Navigates to the url"""
-        self.page.goto(url=url)
-    
-    def capture_screen(self, path: str | None = None) -> bytes:
-        """Capture the screenshot of page"""
-        if path:
-            return self.page.screenshot(path=path, type="png")
-        return self.page.screenshot(type="png")
-    
-    def get_current_url(self) -> str:
-        """Get the current url of page"""
-        return self.page.url
-    
-    @function_tool
-    def open_web_browser(self, **kwargs):
-        """Opens the web browser"""
-        # We are already doing this by default
-        # Reduces additional request to llm
-        pass
-    
-    @function_tool
-    def wait_5_seconds(self, **kwargs):
-        """Waits for 5 seconds to load dynamic content"""
-        time.sleep(5)
-
-    @function_tool
-    def go_back(self, **kwargs):
-        """Go to the previous page in history"""
-        self.page.go_back()
-    
-    @function_tool
-    def go_forward(self, **kwargs):
-        """Go to the next page in history"""
-        self.page.go_forward()
-    
-    @function_tool
-    def search(self, **kwargs):
-        """Go to search engine to search and start the actions"""
-        # We'll default to google search for now
-        # NOTE: sometimes for security reasons, google might ask to solve captcha
-        # Other alternatives include duckduck go, brave search
-        self.page.goto("https://www.google.com/")
-    
-    @function_tool
-    def navigate(self, url: str, **kwargs):
-        """Go to the specified url"""
-        self.page.goto(url=url)
-    
-    @function_tool
-    def click_at(self, x: int, y: int, **kwargs):
-        """Click at a specific coordinates on the webpage"""
-        self.page.mouse.click(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-
-    @function_tool
-    def hover_at(self, x: int, y: int, **kwargs):
-        """Hover the mouse at a specific coordinate on the webpage"""
-        self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-
-    @function_tool
-    def type_text_at(self,
-                     text: str,
-                     x: int,
-                     y: int,
-                     press_enter: Optional[bool] = True,
-                     clear_before_typing: Optional[bool] = True,
-                     **kwargs):
-        """Type text at a specific coordinate"""
-        px, py = denormalize_x(x, width=self.width), denormalize_y(y, height=self.height)
-        self.page.mouse.click(px, py)
-        if clear_before_typing:
-            self.page.keyboard.press("Control+A") # Win/Linux: Control
-            self.page.keyboard.press("Backspace")
-        self.page.keyboard.type(text)
-        if press_enter:
-            self.page.keyboard.press("Enter")
-
-    @function_tool
-    def key_combination(self, keys: str, **kwargs):
-        """
-        Press keyboard keys or combinations, such as Control+C or Enter
-        """
-        self.page.keyboard.press(keys)
-
-    @function_tool
-    def scroll_document(self, direction: str = "down", **kwargs):
-        """Scrolls the entire webpage up, down, left, or right."""
-        direction = direction.lower()
-        if direction == "down":
-            self.page.keyboard.press("PageDown")
-        elif direction == "up":
-            self.page.keyboard.press("PageUp")
-        elif direction == "left":
-            # We'll keep 400 for now, inc/dec later if needed
-            self.page.evaluate("window.scrollBy(-400, 0)")
-        elif direction == "right":
-            self.page.evaluate("window.scrollBy(400, 0)")
-
-    @function_tool
-    def scroll_at(self,
-                  x: int,
-                  y: int,
-                  direction: str = "down",
-                  magnitude: Optional[int] = 800,
-                  **kwargs):
-        """
-        Scrolls a specific element or area at coordinate (x, y)
-        in the specified direction by a certain magnitude.
-        """
-        self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-        dy = magnitude if direction.lower() == "down" else -magnitude
-        self.page.mouse.wheel(0, dy)
-
-    @function_tool
-    def drag_and_drop(self,
-                      x: int,
-                      y: int,
-                      destination_x: int,
-                      destination_y: int,
-                      **kwargs):
-        """
-        Drags an element from a starting coordinate (x, y) and drops it at
-        a destination coordinate (destination_x, destination_y).
-        All coordinates are based on a 1000x1000 grid.
-
-        Args:
-            x: int (0-999)
-            y: int (0-999)
-            destination_x: int (0-999)
-            destination_y: int (0-999)
-        """
-        self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-        self.page.wait_for_load_state(state="networkidle")
-        self.page.mouse.down()
-        self.page.mouse.move(
-            denormalize_x(destination_x),
-            denormalize_y(destination_y)
-        )
-        self.page.wait_for_load_state(state="networkidle")
-        self.page.mouse.up()
-
-    def _wait_after_action(self, wait_time_s: int = 5):
-        """Wait for page stability after each action"""
-        try:
-            self.page.wait_for_load_state(state="networkidle",
-                                          timeout=wait_time_s * 1000)
-        except Exception:
-            pass
-        # Wait for additional 500ms to settle things
-        time.sleep(0.5)
-
-    @time_logger
-    def execute_action(self,
-                       action_name: str,
-                       action_args: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute individual action"""
-        try:
-            execution_method = self.actions_map.get(action_name)
-            if not execution_method:
-                logger.warning(f"Action not implemented: {action_name}")
-                return {
-                    "warning": f"Action `{action_name}` was not implemented"
-                }
-            
-            logger.info(f"[ACTION] {action_name}: {action_args}")
-            
-            execution_method(**action_args)
-            
-            self._wait_after_action()
-            return {}
-        except Exception as e:
-            logger.error(f"Error executing action: '{action_name}': {e}", exc_info=True)
-            return {"error": str(e)}
+# Function tools exposed to the model, in declaration order
+ACTION_NAMES = (
+    "open_web_browser",
+    "wait_5_seconds",
+    "go_back",
+    "go_forward",
+    "search",
+    "navigate",
+    "click_at",
+    "hover_at",
+    "type_text_at",
+    "key_combination",
+    "scroll_document",
+    "scroll_at",
+    "drag_and_drop",
+)
+
+@functools.lru_cache(maxsize=None)
+def _action_params(manager_cls: type, action_name: str) -> frozenset:
+    """Get the argument names an action accepts, extra model arguments are dropped"""
+    params = inspect.signature(getattr(manager_cls, action_name)).parameters
+    return frozenset(params) - {"self"}
+
+# Actions that load a new document, only these wait for the full page load
+NAV_ACTIONS = frozenset({"navigate", "search", "go_back", "go_forward"})
+
+# Direction -> how scroll_document scrolls the page, a key press or a script
+# We'll keep 400 for now for left/right, inc/dec later if needed
+SCROLL_DOCUMENT_OPS: dict[str, tuple[str, str]] = {
+    "down": ("press", "PageDown"),
+    "up": ("press", "PageUp"),
+    "left": ("eval", "window.scrollBy(-400, 0)"),
+    "right": ("eval", "window.scrollBy(400, 0)")
+}
+
+def _scroll_document_op(direction: str) -> tuple[str, str]:
+    """Get the scroll_document operation for a direction, rejecting unknown ones"""
+    try:
+        return SCROLL_DOCUMENT_OPS[direction.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported scroll direction: `{direction}`") from None
+
+# Registered once per context, each call then only moves the single feedback circle
+HIGHLIGHT_INIT_JS = """
+window.__playwrightMoveFeedback = (x, y) => {
+    let div = document.getElementById("playwright-feedback-circle");
+    if (!div) {
+        div = document.createElement('div');
+        div.id = "playwright-feedback-circle";
+        div.style.pointerEvents = 'none';
+        div.style.border = '4px solid red';
+        div.style.borderRadius = '50%';
+        div.style.width = '20px';
+        div.style.height = '20px';
+        div.style.position = 'fixed';
+        div.style.zIndex = '9999';
+        document.body.appendChild(div);
+    }
+    div.hidden = false;
+    div.style.left = x - 10 + 'px';
+    div.style.top = y - 10 + 'px';
+
+    clearTimeout(window.__playwrightFeedbackTimer);
+    window.__playwrightFeedbackTimer = setTimeout(() => {
+        div.hidden = true;
+    }, 2000);
+};
+"""
+HIGHLIGHT_JS = "([x, y]) => window.__playwrightMoveFeedback && window.__playwrightMoveFeedback(x, y)"
+
+class _SharedBrowser:
+    """A launched browser shared by the managers on one event loop, with its user count"""
+    __slots__ = ("playwright", "browser", "users")
+
+    def __init__(self, playwright, browser):
+        self.playwright = playwright
+        self.browser = browser
+        self.users = 0
 
 class AsyncBrowserManager:
     """Manages all interactions with playwright browser asynchronously"""
 
+    # Playwright objects are bound to their event loop, so browsers are shared per loop.
+    # event loop -> {headless: shared browser}, each manager only opens its own context
+    _shared_browsers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    _launch_locks: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
     def __init__(self,
                  page_width: int = 1440,
                  page_height: int = 900,
-                 headless: bool = True):
+                 headless: bool = True,
+                 highlight_delay_s: float = 1.0):
         
         self.width = page_width
         self.height = page_height
         self.headless_mode = headless
+        # Pause after highlighting the cursor so it can be seen, 0 to skip
+        self.highlight_delay_s = highlight_delay_s
 
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
-
-        self.actions_map = {
-            "open_web_browser": self.open_web_browser,
-            "wait_5_seconds": self.wait_5_seconds,
-            "go_back": self.go_back,
-            "go_forward": self.go_forward,
-            "search": self.search,
-            "navigate": self.navigate,
-            "click_at": self.click_at,
-            "hover_at": self.hover_at,
-            "type_text_at": self.type_text_at,
-            "key_combination": self.key_combination,
-            "scroll_document": self.scroll_document,
-            "scroll_at": self.scroll_at,
-            "drag_and_drop": self.drag_and_drop
-        }
+        self._shared_loop = None
+        self._shared = None
     
+    @classmethod
+    def tools(cls) -> list:
+        """Get the function tools for the model declarations"""
+        return [getattr(cls, name) for name in ACTION_NAMES]
+
+    async def _acquire_browser(self) -> _SharedBrowser:
+        """Get the browser shared on this event loop, launching it for the first user"""
+        loop = asyncio.get_running_loop()
+        lock = self._launch_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            loop_browsers = self._shared_browsers.setdefault(loop, {})
+            shared = loop_browsers.get(self.headless_mode)
+            # A crashed browser is left to its current users, new ones get a fresh launch
+            if shared is None or not shared.browser.is_connected():
+                logger.info("Starting Playwright browser in %s mode...",
+                            "headless" if self.headless_mode else "browser")
+                playwright = await async_playwright().start()
+                try:
+                    browser = await playwright.chromium.launch(headless=self.headless_mode)
+                except Exception:
+                    await playwright.stop()
+                    raise
+                shared = loop_browsers[self.headless_mode] = _SharedBrowser(playwright, browser)
+            shared.users += 1
+        self._shared_loop = loop
+        self._shared = shared
+        return shared
+
+    async def _release_browser(self):
+        """Drop this manager's use of the shared browser, closing it after the last user"""
+        loop, self._shared_loop = self._shared_loop, None
+        shared, self._shared = self._shared, None
+        async with self._launch_locks[loop]:
+            shared.users -= 1
+            if shared.users:
+                return
+            loop_browsers = self._shared_browsers.get(loop, {})
+            # It may already have been replaced after a crash
+            if loop_browsers.get(self.headless_mode) is shared:
+                del loop_browsers[self.headless_mode]
+            try:
+                if shared.browser.is_connected():
+                    await shared.browser.close()
+            finally:
+                await shared.playwright.stop()
+
     async def start(self):
         """Start playwright and create a browser page"""
-        logger.info(
-            "Starting Playwright browser in "
-            f"{'headless' if self.headless_mode else 'browser'} mode..."
-        )
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless_mode)
+        shared = await self._acquire_browser()
+        self.playwright = shared.playwright
+        self.browser = shared.browser
         self.context = await self.browser.new_context(
             viewport={"width": self.width, "height": self.height}
         )
+        await self.context.add_init_script(HIGHLIGHT_INIT_JS)
         self.page = await self.context.new_page()
         logger.info("BrowserManager initialized successfully.")
         return self
     
     async def close(self):
-        """Close browser and stop playwright"""
+        """Close the page's context, and the browser and playwright if no one else uses them"""
         logger.info("Closing browser and cleaning up resources...")
         try:
-            if self.browser:
-                await self.browser.close()
-            if self.playwright:
-                await self.playwright.stop()
+            try:
+                if self.context:
+                    await self.context.close()
+            except Exception as e:
+                # Nothing left to close once the browser is gone
+                if self.browser is not None and self.browser.is_connected():
+                    raise
+                logger.warning("Browser disconnected, skipping context close: %s", e)
+            finally:
+                if self._shared_loop:
+                    await self._release_browser()
         except Exception as e:
-            logger.warning(f"Error during browser close: {e}")
+            logger.warning("Error during browser close: %s", e)
             raise
         finally:
             self.browser = None
@@ -344,14 +218,14 @@ class AsyncBrowserManager:
         return self.page.url
     
     @function_tool
-    async def open_web_browser(self, **kwargs):
+    async def open_web_browser(self):
         """Opens the web browser"""
         # We are already doing this by default
         # Reduces additional request to llm
         pass
 
     @function_tool
-    async def wait_5_seconds(self, **kwargs):
+    async def wait_5_seconds(self):
         """
         Pauses execution for 5 seconds to allow dynamic
         content to load or animations to complete.
@@ -359,17 +233,17 @@ class AsyncBrowserManager:
         await asyncio.sleep(5)
 
     @function_tool
-    async def go_back(self, **kwargs):
+    async def go_back(self):
         """Navigates to the previous page in the browser's history."""
         await self.page.go_back()
     
     @function_tool
-    async def go_forward(self, **kwargs):
+    async def go_forward(self):
         """Navigates to the next page in the browser's history."""
         await self.page.go_forward()
     
     @function_tool
-    async def search(self, **kwargs):
+    async def search(self):
         """
         Navigates to the default search engine's homepage (e.g., Google).
         Useful for starting a new search task.
@@ -380,12 +254,12 @@ class AsyncBrowserManager:
         await self.page.goto("https://www.google.com/")
     
     @function_tool
-    async def navigate(self, url: str, **kwargs):
+    async def navigate(self, url: str):
         """Navigates the browser directly to the specified URL."""
         await self.page.goto(url=url)
     
     @function_tool
-    async def click_at(self, x: int, y: int, **kwargs):
+    async def click_at(self, x: int, y: int):
         """
         Clicks at a specific coordinate on the webpage.
         The x and y values are based on a 1000x1000 grid and are scaled to the screen dimensions.
@@ -394,16 +268,12 @@ class AsyncBrowserManager:
             x: int (0-1000)
             y: int (0-1000)
         """
-        await self.highlight_mouse(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height))
-        await self.page.mouse.click(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
+        px, py = denormalize(x, y, self.width, self.height)
+        await self.highlight_mouse(px, py)
+        await self.page.mouse.click(px, py)
 
     @function_tool
-    async def hover_at(self, x: int, y: int, **kwargs):
+    async def hover_at(self, x: int, y: int):
         """
         Hovers the mouse at a specific coordinate on the webpage.
         Useful for revealing sub-menus. The x and y values are based on a 1000x1000 grid.
@@ -412,13 +282,9 @@ class AsyncBrowserManager:
             x: int (0-1000)
             y: int (0-1000)
         """
-        await self.highlight_mouse(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height))
-        await self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
+        px, py = denormalize(x, y, self.width, self.height)
+        await self.highlight_mouse(px, py)
+        await self.page.mouse.move(px, py)
 
     @function_tool
     async def type_text_at(self,
@@ -426,8 +292,7 @@ class AsyncBrowserManager:
                            x: int,
                            y: int,
                            press_enter: Optional[bool] = True,
-                           clear_before_typing: Optional[bool] = True,
-                           **kwargs):
+                           clear_before_typing: Optional[bool] = True):
         """
         Types text at a specific coordinate, defaults to clearing the field first and
         pressing ENTER after typing, but these can be disabled.
@@ -439,7 +304,7 @@ class AsyncBrowserManager:
             press_enter: bool (Optional, default True)
             clear_before_typing: bool (Optional, default True)
         """
-        px, py = denormalize_x(x, width=self.width), denormalize_y(y, height=self.height)
+        px, py = denormalize(x, y, self.width, self.height)
         await self.highlight_mouse(px, py)
         await self.page.mouse.click(px, py)
         if clear_before_typing:
@@ -450,7 +315,7 @@ class AsyncBrowserManager:
             await self.page.keyboard.press("Enter")
 
     @function_tool
-    async def key_combination(self, keys: str, **kwargs):
+    async def key_combination(self, keys: str):
         """
         Press keyboard keys or combinations, such as "Control+C" or "Enter".
         Useful for triggering actions (like submitting a form with "Enter") or clipboard operations.
@@ -461,31 +326,25 @@ class AsyncBrowserManager:
         await self.page.keyboard.press(keys)
 
     @function_tool
-    async def scroll_document(self, direction: str = "down", **kwargs):
+    async def scroll_document(self, direction: str = "down"):
         """
         Scrolls the entire webpage "up", "down", "left", or "right".
         
         Args:
             direction: str ("up", "down", "left", or "right")
         """
-        direction = direction.lower()
-        if direction == "down":
-            await self.page.keyboard.press("PageDown")
-        elif direction == "up":
-            await self.page.keyboard.press("PageUp")
-        elif direction == "left":
-            # We'll keep 400 for now, inc/dec later if needed
-            await self.page.evaluate("window.scrollBy(-400, 0)")
-        elif direction == "right":
-            await self.page.evaluate("window.scrollBy(400, 0)")
+        op, arg = _scroll_document_op(direction)
+        if op == "press":
+            await self.page.keyboard.press(arg)
+        else:
+            await self.page.evaluate(arg)
 
     @function_tool
     async def scroll_at(self,
                         x: int,
                         y: int,
                         direction: str = "down",
-                        magnitude: Optional[int] = 800,
-                        **kwargs):
+                        magnitude: Optional[int] = 800):
         """
         Scrolls a specific element or area at coordinate (x, y) in
         the specified direction by a certain magnitude. Coordinates
@@ -497,13 +356,9 @@ class AsyncBrowserManager:
             direction: str ("up", "down", "left", "right")
             magnitude: int (0-999, Optional, default 800)
         """
-        await self.highlight_mouse(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height))
-        await self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
+        px, py = denormalize(x, y, self.width, self.height)
+        await self.highlight_mouse(px, py)
+        await self.page.mouse.move(px, py)
         dy = magnitude if direction.lower() == "down" else -magnitude
         await self.page.mouse.wheel(0, dy)
 
@@ -512,8 +367,7 @@ class AsyncBrowserManager:
                             x: int,
                             y: int,
                             destination_x: int,
-                            destination_y: int,
-                            **kwargs):
+                            destination_y: int):
         """
         Drags an element from a starting coordinate (x, y) and drops it at
         a destination coordinate (destination_x, destination_y).
@@ -525,57 +379,39 @@ class AsyncBrowserManager:
             destination_x: int (0-1000)
             destination_y: int (0-1000)
         """
-        await self.page.mouse.move(
-            denormalize_x(x, width=self.width),
-            denormalize_y(y, height=self.height)
-        )
-        await self.page.wait_for_load_state(state="networkidle")
+        # Short bounded pauses let drag handlers register each step, the page itself
+        # is settled by the wait after the action
+        await self.page.mouse.move(*denormalize(x, y, self.width, self.height))
         await self.page.mouse.down()
+        await self.page.wait_for_timeout(50)
         await self.page.mouse.move(
-            denormalize_x(destination_x),
-            denormalize_y(destination_y)
+            *denormalize(destination_x, destination_y, self.width, self.height)
         )
-        await self.page.wait_for_load_state(state="networkidle")
+        await self.page.wait_for_timeout(50)
         await self.page.mouse.up()
 
-    async def _wait_after_action(self, wait_time_s: int = 5):
-        """Wait for page stability after each action"""
+    async def _wait_after_action(self, action_name: str, wait_time_s: int = 5):
+        """Wait for page stability after each action, based on the action"""
+        # NOTE: networkidle rarely fires on pages that keep polling, load/domcontentloaded do
         try:
-            await self.page.wait_for_load_state(state="networkidle",
-                                                timeout=wait_time_s * 1000)
+            if action_name in NAV_ACTIONS:
+                await self.page.wait_for_load_state(state="load",
+                                                    timeout=wait_time_s * 1000)
+            else:
+                # Only catches navigations triggered by the action, like clicking a link
+                await self.page.wait_for_load_state(state="domcontentloaded",
+                                                    timeout=1500)
         except Exception:
             pass
-        # Wait for additional 500ms to settle things
-        await asyncio.sleep(1)
+        # Wait for additional 200ms to settle things
+        await asyncio.sleep(0.2)
     
     async def highlight_mouse(self, x: int, y: int):
-        await self.page.evaluate(
-            f"""
-        () => {{
-            const element_id = "playwright-feedback-circle";
-            const div = document.createElement('div');
-            div.id = element_id;
-            div.style.pointerEvents = 'none';
-            div.style.border = '4px solid red';
-            div.style.borderRadius = '50%';
-            div.style.width = '20px';
-            div.style.height = '20px';
-            div.style.position = 'fixed';
-            div.style.zIndex = '9999';
-            document.body.appendChild(div);
-
-            div.hidden = false;
-            div.style.left = {x} - 10 + 'px';
-            div.style.top = {y} - 10 + 'px';
-
-            setTimeout(() => {{
-                div.hidden = true;
-            }}, 2000);
-        }}
-    """
-        )
-        # Wait a bit for the user to see the cursor.
-        await asyncio.sleep(1)
+        """Show a feedback circle at the page coordinates about to be used"""
+        await self.page.evaluate(HIGHLIGHT_JS, [x, y])
+        if self.highlight_delay_s:
+            # Wait a bit for the user to see the cursor.
+            await asyncio.sleep(self.highlight_delay_s)
 
     @time_logger
     async def execute_action(self,
@@ -583,19 +419,33 @@ class AsyncBrowserManager:
                              action_args: Dict[str, Any]) -> Dict[str, Any]:
         """Execute individual action"""
         try:
-            execution_method = self.actions_map.get(action_name)
-            if not execution_method:
-                logger.warning(f"Action not implemented: {action_name}")
+            if action_name not in ACTION_NAMES:
+                logger.warning("Action not implemented: %s", action_name)
                 return {
                     "warning": f"Action `{action_name}` was not implemented"
                 }
             
-            logger.info(f"[ACTION] {action_name}: {action_args}")
+            logger.info("[ACTION] %s: %s", action_name, action_args)
             
-            await execution_method(**action_args)
+            allowed = _action_params(type(self), action_name)
+            await getattr(self, action_name)(
+                **{k: v for k, v in action_args.items() if k in allowed}
+            )
             
-            await self._wait_after_action()
+            await self._wait_after_action(action_name)
             return {}
         except Exception as e:
-            logger.error(f"Error executing action: '{action_name}': {e}", exc_info=True)
+            logger.error("Error executing action: '%s': %s", action_name, e, exc_info=True)
             return {"error": str(e)}
+
+class BrowserManager(SyncWrapper):
+    """Sync facade over AsyncBrowserManager, running it on a private event loop"""
+
+    def __init__(self, *args, **kwargs):
+        """Takes the same arguments as AsyncBrowserManager"""
+        super().__init__(AsyncBrowserManager(*args, **kwargs))
+
+    def start(self):
+        """Start playwright and create a browser page"""
+        self.run_sync(self._wrapped.start())
+        return self
@@ -12,6 +12,15 @@ VERTEXAI_LOCATION = os.getenv("VERTEXAI_LOCATION")
 
 MODEL_NAME = "gemini-2.5-pro"
 
+# Reuse the model's first response for runs opening with the same goal and screenshot
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "false").lower() == "true"
+
+# Cap on concurrent Gemini requests across API runs, 0 for no cap
+GEMINI_MAX_INFLIGHT = int(os.getenv("GEMINI_MAX_INFLIGHT", "0"))
+
+# Multiplex async Gemini requests over HTTP/2, needs the `h2` package
+GEMINI_HTTP2 = os.getenv("GEMINI_HTTP2", "false").lower() == "true"
+
 if not GEMINI_API_KEY and not USE_VERTEXAI:
     raise ValueError("Please set either GEMINI_API_KEY or USE_VERTEXAI=true in .env")
 
@@ -21,6 +30,12 @@ if USE_VERTEXAI and (not VERTEXAI_PROJECT_ID or not VERTEXAI_LOCATION):
 SCREEN_WIDTH = 1440
 SCREEN_HEIGHT = 900
 
+# Longer side of the screenshots sent to the model, larger ones are downscaled
+SCREENSHOT_MAX_SIDE = 1280
+
+# Seconds to pause after highlighting the cursor on the page, so it can be followed in headed runs
+HIGHLIGHT_DELAY_S = 1.0
+
 # Default value, expects url from CLI else starts with search engine
 INITIAL_URL = None
 
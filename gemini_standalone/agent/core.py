@@ -1,14 +1,27 @@
 """Main agent orchestration logic"""
+import os
+import asyncio
+import hashlib
 from typing import Optional
 
 from .gemini_client import GeminiClient
 from .browser import BrowserManager, AsyncBrowserManager
-from .image_utils import overlay_grid_on_image
+from .image_utils import overlay_grid_on_image, IMAGE_MIME_TYPES
 from .utils import get_safety_confirmation, time_logger
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+def _screenshot_digest(screenshot: bytes) -> bytes:
+    """Content digest to tell if the screen changed between turns"""
+    return hashlib.blake2b(screenshot, digest_size=16).digest()
+
+def _write_screenshot(path: str, screenshot: bytes):
+    """Save a screenshot to disk for debugging"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(screenshot)
+
 class ComputerUseAgent:
     """Class for orchestrating the computer use agent"""
 
@@ -47,22 +60,23 @@ class ComputerUseAgent:
         try:
             self.browser.start()
             if initial_url:
-                logger.info(f"Starting browser with url: {initial_url}")
+                logger.info("Starting browser with url: %s", initial_url)
                 self.browser.goto(initial_url)
             else:
                 logger.info("No initial URL provided. Opening default search engine.")
                 self.browser.search()
 
-            logger.info(f"Agent goal: {goal}")
+            logger.info("Agent goal: %s", goal)
 
             # Capture initial state
             initial_image = self.browser.capture_screen()
             contents = self.llm.build_initial_message(goal, initial_image)
+            last_digest = _screenshot_digest(initial_image)
             
             # TODO: Add total execution time.
             # Run the react loop for max_turns
             for turn in range(self.max_turns):
-                logger.info(f"===== Turn {turn + 1}/{self.max_turns} =====")
+                logger.info("===== Turn %s/%s =====", turn + 1, self.max_turns)
                 
                 # Generate content
                 response = self.llm.generate_content(contents)
@@ -81,13 +95,18 @@ class ComputerUseAgent:
                     final_response = " ".join(
                         [p.text for p in candidate.content.parts if p.text]
                     )
-                    logger.info(f"Final Output: {final_response}")
+                    logger.info("Final Output: %s", final_response)
                     break
                 
                 # Execute actions and send back screenshots
                 action_results = self._execute_function_calls(function_calls)
                 screenshot = self.browser.capture_screen()
                 current_url = self.browser.get_current_url()
+                # Same screen as last turn, the model already has it in context
+                digest = _screenshot_digest(screenshot)
+                if digest == last_digest:
+                    screenshot = None
+                last_digest = digest
 
                 function_response_content = self.llm.build_function_responses_message(
                     screenshot=screenshot,
@@ -103,7 +122,7 @@ class ComputerUseAgent:
                 final_response = "Goal not completed within the maximum turn limit."
 
         except Exception as e:
-            logger.error(f"Agent encountered an error: {e}", exc_info=True)
+            logger.error("Agent encountered an error: %s", e, exc_info=True)
             final_response = f"Agent terminated due to error: {e}"
         finally:
             self.browser.close()
@@ -116,10 +135,14 @@ class AsyncComputerUseAgent:
     def __init__(self,
                  llm_client: GeminiClient,
                  browser_manager: AsyncBrowserManager,
-                 max_turns: int = 20):
+                 max_turns: int = 20,
+                 screenshot_max_side: Optional[int] = None):
         self.llm = llm_client
         self.browser = browser_manager
         self.max_turns = max_turns
+        # Screenshots are downscaled to this before they are sent, the actions take
+        # normalized coordinates so they don't depend on the image size
+        self.screenshot_max_side = screenshot_max_side
 
     async def _execute_function_calls(self, function_calls):
         """Executes the function calls using browser actions"""
@@ -145,25 +168,28 @@ class AsyncComputerUseAgent:
     async def run(self, goal: str, initial_url: Optional[str] = None):
         """Runs the main agent loop"""
         final_response = ""
+        # Debug screenshot writes, they run alongside the next turns instead of before them
+        pending_writes = []
         try:
             await self.browser.start()
             if initial_url:
-                logger.info(f"Starting browser with url: {initial_url}")
+                logger.info("Starting browser with url: %s", initial_url)
                 await self.browser.goto(initial_url)
             else:
                 logger.info("No initial URL provided. Opening default search engine.")
                 await self.browser.search()
 
-            logger.info(f"Agent goal: {goal}")
+            logger.info("Agent goal: %s", goal)
 
             # Capture initial state
             initial_image = await self.browser.capture_screen()
             contents = self.llm.build_initial_message(goal, initial_image)
+            last_digest = _screenshot_digest(initial_image)
             
             # TODO: Add total execution time.
             # Run the react loop for max_turns
             for turn in range(self.max_turns):
-                logger.info(f"===== Turn {turn + 1}/{self.max_turns} =====")
+                logger.info("===== Turn %s/%s =====", turn + 1, self.max_turns)
                 
                 # Generate content
                 response = await self.llm.generate_content_async(contents)
@@ -182,20 +208,36 @@ class AsyncComputerUseAgent:
                     final_response = " ".join(
                         [p.text for p in candidate.content.parts if p.text]
                     )
-                    logger.info(f"[Final Output]: {final_response}")
+                    logger.info("[Final Output]: %s", final_response)
                     break
                 
                 # Execute actions and send back screenshots
                 action_results = await self._execute_function_calls(function_calls)
-                screenshot = await self.browser.capture_screen(path=f"capturex/turn_{turn}.png")
-                # Overlay the grids on the screenshot
-                screenshot_w_grid = overlay_grid_on_image(screenshot)
-                current_url = await self.browser.get_current_url()
+                screenshot = await self.browser.capture_screen()
+                pending_writes.append(asyncio.create_task(
+                    asyncio.to_thread(_write_screenshot, f"capturex/turn_{turn}.png", screenshot)
+                ))
+                digest = _screenshot_digest(screenshot)
+                if digest == last_digest:
+                    # Same screen as last turn, the model already has it in context
+                    screenshot_w_grid = None
+                    current_url = await self.browser.get_current_url()
+                else:
+                    # Overlay the grids on the screenshot in a worker thread, OpenCV releases
+                    # the GIL so other runs on the loop and the url lookup carry on meanwhile
+                    screenshot_w_grid, current_url = await asyncio.gather(
+                        asyncio.to_thread(overlay_grid_on_image, screenshot,
+                                          output_format="jpeg",
+                                          max_side=self.screenshot_max_side),
+                        self.browser.get_current_url(),
+                    )
+                last_digest = digest
 
                 function_response_content = self.llm.build_function_responses_message(
                     screenshot=screenshot_w_grid,
                     current_url=current_url,
-                    results=action_results
+                    results=action_results,
+                    mime_type=IMAGE_MIME_TYPES["jpeg"]
                 )
 
                 # Update state with function responses
@@ -206,9 +248,12 @@ class AsyncComputerUseAgent:
                 final_response = "Goal not completed within the maximum turn limit."
 
         except Exception as e:
-            logger.error(f"Agent encountered an error: {e}", exc_info=True)
+            logger.error("Agent encountered an error: %s", e, exc_info=True)
             final_response = f"Agent terminated due to error: {e}"
         finally:
             await self.browser.close()
+            for write in await asyncio.gather(*pending_writes, return_exceptions=True):
+                if isinstance(write, Exception):
+                    logger.warning("Failed to save a debug screenshot: %s", write)
         
         return final_response
@@ -1,4 +1,8 @@
 """Encapsulate LLM (Gemini) interactions."""
+import asyncio
+import hashlib
+import functools
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Callable
 from google.genai import Client, types
 
@@ -7,6 +11,59 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Browser functions the model shouldn't call
+EXCLUDED_FUNCTIONS = frozenset({"open_web_browser"})
+
+SAFETY_SETTINGS = (
+    types.SafetySetting(
+        category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+        threshold=types.HarmBlockThreshold.BLOCK_NONE),
+    types.SafetySetting(
+        category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+        threshold=types.HarmBlockThreshold.BLOCK_NONE)
+)
+
+# Sent in place of a screenshot identical to the previous one
+SCREEN_UNCHANGED_TEXT = "The screen is unchanged since the last screenshot."
+
+@functools.lru_cache(maxsize=32)
+def _build_config(system_instructions: str,
+                  tools: tuple[Callable[..., object], ...]) -> types.GenerateContentConfig:
+    """Build the generation config, shared by all clients with the same settings"""
+    # NOTE: The returned config is shared, treat it as read only
+    # NOTE: System instructions and tools lead every request, keep them free of dynamic
+    # fields (dates, urls) so the prefix stays identical and hits the implicit cache
+    system_instruction = None
+    if system_instructions:
+        system_instruction = types.Content(
+            role="system",
+            parts=[types.Part(text=system_instructions)],
+        )
+    tool_definitions = [
+        dict(tool.tool_metadata)
+        for tool in tools
+        if tool.__name__ not in EXCLUDED_FUNCTIONS
+    ]
+    return types.GenerateContentConfig(
+        system_instruction=system_instruction,
+        tools=[types.Tool(function_declarations=tool_definitions)],
+        safety_settings=list(SAFETY_SETTINGS)
+    )
+
+# Responses to the opening request of a run, shared by all clients. Runs with the same goal
+# on the same page open identically, later turns depend on the run and aren't cached.
+MAX_CACHED_RESPONSES = 128
+_first_turn_responses: OrderedDict[tuple, types.GenerateContentResponse] = OrderedDict()
+
+def _is_complete_response(response) -> bool:
+    """Check if the model finished its turn normally, blocked or cut off turns aren't reused"""
+    if not response.candidates:
+        return False
+    candidate = response.candidates[0]
+    return (candidate.finish_reason == types.FinishReason.STOP
+            and candidate.content is not None
+            and bool(candidate.content.parts))
+
 class GeminiClient:
     """Gemini client class"""
 
@@ -16,7 +73,10 @@ class GeminiClient:
                  vertexai_location: Optional[str] = None,
                  model_name: str = "gemini-2.5-flash",
                  system_instructions: str = "",
-                 tools: List[Callable[..., object]] = None):
+                 tools: List[Callable[..., object]] = None,
+                 cache_responses: bool = False,
+                 max_inflight: int = 0,
+                 http2: bool = False):
         """Initializes a Gemini client instance.
 
         Args:
@@ -25,21 +85,30 @@ class GeminiClient:
             vertexai_location: GCP region for Vertex AI usage.
             model_name: Gemini model name.
             system_instructions: Optional system instructions.
+            tools: Function tools declared to the model.
+            cache_responses: Reuse the response to an identical opening request.
+            max_inflight: Cap on concurrent async requests through this client, 0 for no cap.
+            http2: Multiplex async requests over HTTP/2 connections, needs the `h2` package.
         """
+        http_options = None
+        if http2:
+            http_options = types.HttpOptions(async_client_args={"http2": True})
         if api_key:
             logger.info("Using Gemini with API key.")
             self.gemini_client = Client(
-                api_key=api_key
+                api_key=api_key,
+                http_options=http_options
             )
         elif vertexai_project and vertexai_location:
             logger.info(
-                f"Using Vertex AI endpoints for project: `{vertexai_project}` "
-                f"in location: `{vertexai_location}`."
+                "Using Vertex AI endpoints for project: `%s` in location: `%s`.",
+                vertexai_project, vertexai_location
             )
             self.gemini_client = Client(
                 vertexai=True,
                 project=vertexai_project,
-                location=vertexai_location
+                location=vertexai_location,
+                http_options=http_options
             )
         else:
             raise ValueError(
@@ -50,117 +119,143 @@ class GeminiClient:
         self.model_name = model_name
         self.system_instructions = system_instructions
 
-        self.tool_definitions = []
-        self.excluded_functions = ["open_web_browser"]
-
-        if tools:
-            for tool in tools:
-                if tool.__name__ in self.excluded_functions:
-                    continue
-                self.tool_definitions.append(tool.tool_metadata())
-
-        self._setup_config()
-
-    def _setup_config(self):
-        """Set up the generation config"""
-        if self.system_instructions:
-            system_instructions_contents = types.Content(
-                role="system",
-                parts=[types.Part(text=self.system_instructions)],
-            )
-            self.config = types.GenerateContentConfig(
-                system_instruction=system_instructions_contents,
-                tools=[types.Tool(function_declarations=self.tool_definitions)],
-                safety_settings=[
-                    types.SafetySetting(
-                        category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                        threshold=types.HarmBlockThreshold.BLOCK_NONE),
-                    types.SafetySetting(
-                        category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                        threshold=types.HarmBlockThreshold.BLOCK_NONE)
-                ]
-            )
-        else:
-            self.config = types.GenerateContentConfig(
-                tools=[types.Tool(function_declarations=self.tool_definitions)],
-                safety_settings=[
-                    types.SafetySetting(
-                        category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                        threshold=types.HarmBlockThreshold.BLOCK_NONE),
-                    types.SafetySetting(
-                        category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                        threshold=types.HarmBlockThreshold.BLOCK_NONE)
-                ]
-            )
+        # Clients built per request with the same tools share one validated config
+        self._config_key = (system_instructions, tuple(tools or ()))
+        self.config = _build_config(*self._config_key)
+        self.cache_responses = cache_responses
+        # Per client, a semaphore binds to the event loop it is first used on. The API
+        # shares one client across runs, so the cap still covers all of them
+        self._inflight = asyncio.Semaphore(max_inflight) if max_inflight > 0 else None
 
     # TODO: add type hint for initial_image
-    def build_initial_message(self, goal: str, initial_image):
+    def build_initial_message(self, goal: str, initial_image, mime_type: str = "image/png"):
         """Build the initial message for llm"""
         return [
             types.Content(
                 role="user",
                 parts=[
                     types.Part(text=goal),
-                    # TODO: check mime_type instead of hardcoding here
-                    types.Part.from_bytes(data=initial_image, mime_type="image/png"),
+                    types.Part.from_bytes(data=initial_image, mime_type=mime_type),
                 ],
             )
         ]
 
+    def _first_turn_key(self, contents: List[types.Content]) -> Optional[tuple]:
+        """Response cache key of the opening request, None if it shouldn't be cached"""
+        # Once the model has acted, the request depends on the run
+        if not self.cache_responses or len(contents) != 1:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        for part in contents[0].parts:
+            if part.text is not None:
+                digest.update(b"text:" + part.text.encode())
+            elif part.inline_data is not None:
+                digest.update(f"{part.inline_data.mime_type}:".encode())
+                digest.update(part.inline_data.data)
+            else:
+                return None
+        return self.model_name, self._config_key, digest.digest()
+
+    def _cached_response(self, key: Optional[tuple]):
+        """Get the cached response for the key, if any"""
+        response = _first_turn_responses.get(key) if key is not None else None
+        if response is None:
+            return None
+        _first_turn_responses.move_to_end(key)
+        logger.info("Reusing the cached response to an identical opening request.")
+        # Each run gets its own copy, runs never share response state
+        return response.model_copy(deep=True)
+
+    def _cache_response(self, key: Optional[tuple], response):
+        """Cache the response for the key, dropping the least recently used one when full"""
+        if key is None or not _is_complete_response(response):
+            return
+        _first_turn_responses[key] = response.model_copy(deep=True)
+        if len(_first_turn_responses) > MAX_CACHED_RESPONSES:
+            _first_turn_responses.popitem(last=False)
+
     @time_logger
     def generate_content(self, contents: List[types.Content]):
         """Generate response from llm"""
+        key = self._first_turn_key(contents)
+        response = self._cached_response(key)
+        if response is not None:
+            return response
+
         response = self.gemini_client.models.generate_content(
             model=self.model_name,
             contents=contents,
             config=self.config
         )
 
+        self._cache_response(key, response)
         return response
     
     @time_logger
     async def generate_content_async(self, contents: List[types.Content]):
         """Generate response from llm using aio client"""
-        response = await self.gemini_client.aio.models.generate_content(
+        key = self._first_turn_key(contents)
+        response = self._cached_response(key)
+        if response is not None:
+            return response
+
+        if self._inflight is None:
+            response = await self._generate_content_async(contents)
+        else:
+            # Runs beyond the cap queue here instead of piling onto the rate limit
+            async with self._inflight:
+                response = await self._generate_content_async(contents)
+
+        self._cache_response(key, response)
+        return response
+
+    async def _generate_content_async(self, contents: List[types.Content]):
+        """Send the request through the aio client"""
+        return await self.gemini_client.aio.models.generate_content(
             model=self.model_name,
             contents=contents,
             config=self.config
         )
 
-        return response
-
     # TODO: add type hint for screenshot
     def build_function_responses_message(self,
                                          screenshot,
                                          current_url: str,
-                                         results: List[tuple[str, Dict[str, Any]]]) -> types.Content:
-        """Build the functions response for each run in the loop"""
-        function_responses = []
-        for name, result in results:
-            response_data = {"url": current_url}
-            response_data.update(result)
-            function_responses.append(
-                types.FunctionResponse(
-                    name=name,
-                    response=response_data,
-                    # BUG: Multimodal function responses are not supported for the model.
-                    # parts=[
-                    #     types.FunctionResponsePart(
-                    #         inline_data=types.FunctionResponseBlob(
-                    #             # TODO: check mime_type instead of hardcoding here
-                    #             mime_type="image/png",
-                    #             data=screenshot
-                    #         )
-                    #     )
-                    # ]
-                )
-            )
-        
+                                         results: List[tuple[str, Dict[str, Any]]],
+                                         mime_type: str = "image/png") -> types.Content:
+        """Build the functions response for each run in the loop.
+
+        A `None` screenshot means the screen didn't change, the model is told so
+        instead of being sent the same image again.
+        """
         # NOTE: Add the screenshot as another part in the `user` response
+        # Kept last, the variable bytes go after everything that can be shared
+        if screenshot is None:
+            screenshot_part = types.Part(text=SCREEN_UNCHANGED_TEXT)
+        else:
+            screenshot_part = types.Part.from_bytes(data=screenshot, mime_type=mime_type)
         return types.Content(
             role="user",
             parts=[
-                *[types.Part(function_response=fr) for fr in function_responses],
-                types.Part.from_bytes(data=screenshot, mime_type="image/png"),
+                *(
+                    types.Part(function_response=types.FunctionResponse(
+                        name=name,
+                        # Sorted so identical results serialize identically across turns,
+                        # built straight from the pairs without an intermediate dict
+                        response=dict([("url", current_url), *sorted(result.items())]),
+                        # BUG: Multimodal function responses are not supported for the model.
+                        # parts=[
+                        #     types.FunctionResponsePart(
+                        #         inline_data=types.FunctionResponseBlob(
+                        #             # TODO: check mime_type instead of hardcoding here
+                        #             mime_type="image/png",
+                        #             data=screenshot
+                        #         )
+                        #     )
+                        # ]
+                    ))
+                    for name, result in results
+                ),
+                screenshot_part,
             ]
         )
@@ -1,54 +1,127 @@
 """Module to add grid overlay over image for better spatial reasoning"""
+import functools
+
 import cv2
 import numpy as np
 
-def overlay_grid_on_image(image_bytes, num_x_lines=12, num_y_lines=9, alpha=0.6):
+# Output formats of the grid overlay and the mime type to send them with
+IMAGE_MIME_TYPES = {
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+}
+
+@functools.lru_cache(maxsize=8)
+def _build_grid_layer(w, h, num_x_lines, num_y_lines):
+    """
+    Draw the grid lines and labels for an image size once, screenshots of the same
+    size reuse it.
+
+    Returns:
+        tuple: Indices of the pixels the grid covers, and their coverage from 0 to 1
+            (anti aliased text is partial). Both arrays are shared and read only.
     """
-    Overlay a semi-transparent coordinate grid on an image and return PNG bytes.
+    font = cv2.FONT_HERSHEY_SIMPLEX
+
+    # grid line positions, the last line falls on the image edge and outside it
+    xs = np.arange(num_x_lines + 1) * w // num_x_lines
+    ys = np.arange(num_y_lines + 1) * h // num_y_lines
+    xs, ys = xs[xs < w], ys[ys < h]
+
+    # Draw the grid as a coverage mask, only its pixels are blended instead of the
+    # whole image. All vertical and horizontal lines go in two strided stores.
+    mask = np.zeros((h, w), np.uint8)
+    mask[:, xs] = 255
+    mask[ys, :] = 255
+
+    # x and y labels, text is irregular so it is still drawn one by one
+    for x in xs.tolist():
+        cv2.putText(mask, f"x={x}", (x + 5, 20), font, 0.5, 255, 1, cv2.LINE_AA)
+    for y in ys.tolist():
+        cv2.putText(mask, f"y={y}", (5, y + 15), font, 0.5, 255, 1, cv2.LINE_AA)
+
+    covered = mask.nonzero()
+    coverage = mask[covered].astype(np.float32) / 255
+    for array in (*covered, coverage):
+        array.setflags(write=False)
+    return covered, coverage
+
+@functools.lru_cache(maxsize=8)
+def _grid_keep_weights(w, h, num_x_lines, num_y_lines, alpha):
+    """
+    Share of each covered pixel that is kept when blending the black grid in.
+
+    Returns:
+        tuple: Indices of the covered pixels, and a (n, 1) column of weights that
+            broadcasts over the color channels. Both are shared and read only.
+    """
+    covered, coverage = _build_grid_layer(w, h, num_x_lines, num_y_lines)
+    keep = (1 - coverage * np.float32(alpha))[:, None]
+    keep.setflags(write=False)
+    return covered, keep
+
+def overlay_grid_on_image(image_bytes, num_x_lines=12, num_y_lines=9, alpha=0.6,
+                          output_format="jpeg", jpeg_quality=90, in_place=False,
+                          max_side=None):
+    """
+    Overlay a semi-transparent coordinate grid on an image and return the encoded bytes.
 
     Args:
         image_bytes (bytes or np.ndarray): Input image (bytes or cv2 image array).
         num_x_lines (int): Number of vertical grid lines.
         num_y_lines (int): Number of horizontal grid lines.
         alpha (float): Transparency of the grid overlay.
+        output_format (str or None): "jpeg" (much faster to encode) or "png",
+            None returns the image array without encoding it.
+        jpeg_quality (int): JPEG quality, 0-100.
+        in_place (bool): Draw directly on an input array instead of a copy of it.
+        max_side (int or None): Downscale the gridded image so its longer side is at
+            most this many pixels, None keeps the full resolution.
 
     Returns:
-        bytes: PNG-encoded image bytes with grid overlay.
+        bytes or np.ndarray: Encoded image bytes with grid overlay, or the array.
     """
     if isinstance(image_bytes, (bytes, bytearray)):
         nparr = np.frombuffer(image_bytes, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        # decode as stored, forcing 3 channels converts images that already have them
+        img = cv2.imdecode(nparr, cv2.IMREAD_UNCHANGED)
+        if img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        elif img.shape[2] == 4:
+            # the alpha channel is dropped by a view, not a conversion
+            img = img[..., :3]
     elif isinstance(image_bytes, np.ndarray):
-        img = image_bytes.copy()
+        img = image_bytes if in_place else image_bytes.copy()
     else:
         raise TypeError("Input must be bytes or a numpy.ndarray")
 
     h, w = img.shape[:2]
 
-    # black grid lines
-    grid_color = (0, 0, 0)
-    font = cv2.FONT_HERSHEY_SIMPLEX
-
-    overlay = img.copy()
+    # blend the black grid into the covered pixels, in place
+    # same as cv2.addWeighted of a full drawn copy, anti aliased text is partial coverage.
+    # Blending towards black is just scaling by the kept share, done in a single buffer
+    covered, keep = _grid_keep_weights(w, h, num_x_lines, num_y_lines, alpha)
+    pixels = img[covered].astype(np.float32)
+    pixels *= keep
+    pixels += 0.5
+    img[covered] = pixels
 
-    # vertical lines + x labels
-    for i in range(num_x_lines + 1):
-        x = int(i * w / num_x_lines)
-        cv2.line(overlay, (x, 0), (x, h), grid_color, 1)
-        cv2.putText(overlay, f"x={x}", (x + 5, 20), font, 0.5, grid_color, 1, cv2.LINE_AA)
+    # downscale after drawing, so the labels still read page pixel coordinates
+    if max_side and max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        img = cv2.resize(img, (round(w * scale), round(h * scale)),
+                         interpolation=cv2.INTER_AREA)
 
-    # horizontal lines + y labels
-    for j in range(num_y_lines + 1):
-        y = int(j * h / num_y_lines)
-        cv2.line(overlay, (0, y), (w, y), grid_color, 1)
-        cv2.putText(overlay, f"y={y}", (5, y + 15), font, 0.5, grid_color, 1, cv2.LINE_AA)
+    if output_format is None:
+        return img
 
-    # blend overlay with image
-    blended = cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0)
-
-    # encode back to PNG bytes
-    success, buf = cv2.imencode(".png", blended)
+    # encode back to bytes, png's deflate is several times slower than jpeg
+    if output_format == "jpeg":
+        success, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    elif output_format == "png":
+        success, buf = cv2.imencode(".png", img)
+    else:
+        raise ValueError(f"Unsupported output format: `{output_format}`")
     if not success:
-        raise RuntimeError("Failed to encode image as PNG")
+        raise RuntimeError(f"Failed to encode image as {output_format.upper()}")
 
     return buf.tobytes()
@@ -0,0 +1,36 @@
+"""Expose the async implementations to synchronous callers."""
+import asyncio
+import functools
+import inspect
+from typing import Any, Optional
+
+class SyncWrapper:
+    """Sync facade over an async object, runs its coroutines on a private event loop"""
+
+    def __init__(self, wrapped: Any, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Initializes the wrapper.
+
+        Args:
+            wrapped: The async object whose coroutine methods are exposed as sync ones.
+            loop: Event loop to run them on, a new one is created if not provided.
+                Objects sharing playwright handles must share the same loop.
+        """
+        # NOTE: Like asyncio.run, this can't be used from a thread with a running loop
+        self._wrapped = wrapped
+        self._loop = loop or asyncio.new_event_loop()
+
+    def run_sync(self, coro):
+        """Run a coroutine to completion on the wrapper's event loop"""
+        return self._loop.run_until_complete(coro)
+
+    def __getattr__(self, name: str):
+        if name in ("_wrapped", "_loop"):
+            raise AttributeError(name)
+        attr = getattr(self._wrapped, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def sync_method(*args, **kwargs):
+            return self.run_sync(attr(*args, **kwargs))
+        return sync_method
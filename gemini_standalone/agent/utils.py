@@ -1,5 +1,6 @@
 """Utils file for common functions"""
 import time
+import logging
 import functools
 import asyncio
 
@@ -7,27 +8,36 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
-def denormalize_x(x: int, width: int = 1440) -> int:
+def denormalize_x(x: int, width: int = 1440, /) -> int:
     """Denormalize normalized x coordinates wrt page width"""
     # Gemini gives 0-1000 normalized pixels
-    return int(x / 1000 * width)
+    # Multiply first, x / 1000 * width truncated exact results (175 on 1440 gave 251)
+    return int(x * width // 1000)
 
-def denormalize_y(y: int, height: int = 900) -> int:
+def denormalize_y(y: int, height: int = 900, /) -> int:
     """Denormalize normalized y coordinates wrt page height"""
-    return int(y / 1000 * height)
+    return int(y * height // 1000)
+
+def denormalize(x: int, y: int, width: int, height: int, /) -> tuple[int, int]:
+    """Denormalize a normalized (x, y) point wrt page size in a single call"""
+    return int(x * width // 1000), int(y * height // 1000)
+
+# Accepted answers to the safety confirmation prompt
+VALID_DECISIONS = frozenset({"y", "n", "ye", "yes", "no"})
+NO_DECISIONS = frozenset({"n", "no"})
 
 def get_safety_confirmation(safety_decision: dict):
     """Prompt user for confirmation when safety check is triggered."""
     # NOTE: This might not be needed, but docs says we might have to implement one
     # FIXME: Ideally for full automation, we should skip this or OK everything
     logger.info("Safety service requires explicit confirmation!")
-    logger.info(f"Explanation: {safety_decision['explanation']}")
+    logger.info("Explanation: %s", safety_decision['explanation'])
 
     decision = ""
-    while decision.lower() not in ("y", "n", "ye", "yes", "no"):
-        decision = input("Do you wish to proceed? [Y]es/[N]o\n")
+    while decision not in VALID_DECISIONS:
+        decision = input("Do you wish to proceed? [Y]es/[N]o\n").strip().casefold()
 
-    if decision.lower() in ("n", "no"):
+    if decision in NO_DECISIONS:
         return "TERMINATE"
     return "CONTINUE"
 
@@ -36,23 +46,28 @@ def time_logger(func):
     Decorator to log execution time for a function,
     usually for the function tools
     """
+    # Checked per call as the level can change at runtime, timing is skipped when INFO is off
     if asyncio.iscoroutinefunction(func):
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start = time.time()
+            if not logger.isEnabledFor(logging.INFO):
+                return await func(*args, **kwargs)
+            start = time.perf_counter()
             try:
                 return await func(*args, **kwargs)
             finally:
-                duration = time.time() - start
-                logger.info(f"[TIME] {func.__qualname__} executed in {duration:.4f} seconds.")
+                duration = time.perf_counter() - start
+                logger.info("[TIME] %s executed in %.4f seconds.", func.__qualname__, duration)
         return async_wrapper
     else:
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start = time.time()
+            if not logger.isEnabledFor(logging.INFO):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
             try:
                 return func(*args, **kwargs)
             finally:
-                duration = time.time() - start
-                logger.info(f"[TIME] {func.__qualname__} executed in {duration:.4f} seconds.")
-        return sync_wrapper
+                duration = time.perf_counter() - start
+                logger.info("[TIME] %s executed in %.4f seconds.", func.__qualname__, duration)
+        return sync_wrapper
\ No newline at end of file
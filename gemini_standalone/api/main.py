@@ -1,20 +1,75 @@
 """FastAPI app entry point for Gemini Computer Use Agent API"""
 import time
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from api import routes
+from agent.config import (GEMINI_API_KEY, USE_VERTEXAI, VERTEXAI_PROJECT_ID, VERTEXAI_LOCATION,
+                          MODEL_NAME, RESPONSE_CACHE, GEMINI_MAX_INFLIGHT, GEMINI_HTTP2)
+from agent.system_prompt import SYSTEM_PROMPT
+from agent.browser import AsyncBrowserManager
+from agent.gemini_client import GeminiClient
 from agent.logger import get_logger
 
 logger = get_logger(__name__)
 
+# (method, path, process time) of recent requests, logged in batches off the request path
+REQUEST_LOG_FLUSH_S = 1.0
+# Flushed early when this many requests are waiting, so none are dropped under load
+REQUEST_LOG_MAX_PENDING = 1024
+_request_log = deque()
+
+def _flush_request_log():
+    """Log the buffered requests in one record"""
+    entries = [_request_log.popleft() for _ in range(len(_request_log))]
+    if not entries or not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("%d requests:\n%s", len(entries),
+                "\n".join("%s %s processed in %.3fs" % entry for entry in entries))
+
+async def _flush_request_log_loop(full: asyncio.Event):
+    """Flush the request log every REQUEST_LOG_FLUSH_S, or early when the buffer fills up"""
+    while True:
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(full.wait(), REQUEST_LOG_FLUSH_S)
+        full.clear()
+        _flush_request_log()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan handler for a fastapi service"""
     logger.info("Starting Gemini Computer Use API...")
+    # One client for all requests, so http connections and auth tokens are reused
+    tools_list = AsyncBrowserManager.tools()
+    if not USE_VERTEXAI:
+        app.state.llm = GeminiClient(api_key=GEMINI_API_KEY,
+                                     model_name=MODEL_NAME,
+                                     system_instructions=SYSTEM_PROMPT,
+                                     tools=tools_list,
+                                     cache_responses=RESPONSE_CACHE,
+                                     max_inflight=GEMINI_MAX_INFLIGHT,
+                                     http2=GEMINI_HTTP2)
+    else:
+        app.state.llm = GeminiClient(vertexai_project=VERTEXAI_PROJECT_ID,
+                                     vertexai_location=VERTEXAI_LOCATION,
+                                     model_name=MODEL_NAME,
+                                     system_instructions=SYSTEM_PROMPT,
+                                     tools=tools_list,
+                                     cache_responses=RESPONSE_CACHE,
+                                     max_inflight=GEMINI_MAX_INFLIGHT,
+                                     http2=GEMINI_HTTP2)
+    app.state.request_log_full = asyncio.Event()
+    flush_task = asyncio.create_task(_flush_request_log_loop(app.state.request_log_full))
     yield
+    flush_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await flush_task
+    _flush_request_log()
     logger.info("Shutting down Gemini Computer Use API...")
 
 app = FastAPI(
@@ -44,7 +99,10 @@ async def add_process_time_header(request: Request, call_next):
     process_time = time.perf_counter() - start_time
     
     response.headers["X-Process-Time"] = f"{process_time:.3f}"
-    logger.info(f"{request.method} {request.url.path} processed in {process_time:.3f}s")
+    _request_log.append((request.method, request.url.path, process_time))
+    if len(_request_log) >= REQUEST_LOG_MAX_PENDING:
+        # Let the flush task drain it, the request doesn't wait on the logging
+        request.app.state.request_log_full.set()
     
     return response
 
@@ -1,15 +1,13 @@
 """API routes for Gemini Computer Use Agent"""
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from pydantic.config import ConfigDict
 
-from agent.config import (GEMINI_API_KEY, USE_VERTEXAI, VERTEXAI_PROJECT_ID, VERTEXAI_LOCATION,
-                          MODEL_NAME, SCREEN_WIDTH, SCREEN_HEIGHT, MAX_AGENT_TURNS)
-from agent.browser import BrowserManager, AsyncBrowserManager
-from agent.gemini_client import GeminiComputerUseClient
-from agent.core import ComputerUseAgent, AsyncComputerUseAgent
+from agent.config import SCREEN_WIDTH, SCREEN_HEIGHT, MAX_AGENT_TURNS, SCREENSHOT_MAX_SIDE
+from agent.browser import AsyncBrowserManager
+from agent.core import AsyncComputerUseAgent
 from agent.logger import get_logger
 
 logger = get_logger(__name__)
@@ -35,44 +33,8 @@ class AgentRunResponse(BaseModel):
     success: bool
     message: str
 
-@router.post("/run_agent_sync", response_model=AgentRunResponse)
-def run_agent_sync(req: AgentRunRequest):
-    """Runs the Gemini Computer Use Agent with the given goal"""
-
-    try:
-        browser = BrowserManager(
-            page_width=SCREEN_WIDTH,
-            page_height=SCREEN_HEIGHT,
-            # Read this based on env, for containers, read the respective variable
-            headless=True,
-        )
-
-        if not USE_VERTEXAI:
-            llm = GeminiComputerUseClient(api_key=GEMINI_API_KEY,
-                                          model_name=MODEL_NAME)
-        else:
-            llm = GeminiComputerUseClient(vertexai_project=VERTEXAI_PROJECT_ID,
-                                          vertexai_location=VERTEXAI_LOCATION)
-
-        agent = ComputerUseAgent(
-            llm_client=llm,
-            browser_manager=browser,
-            max_turns=req.max_turns,
-        )
-
-        # Run the agent synchronously for now
-        # TODO: Propagate errors/exceptions to client, supressing for now inside .run
-        result_text = agent.run(goal=req.goal, initial_url=req.url)
-
-        return AgentRunResponse(success=True,
-                                message=result_text or "Agent run completed successfully.")
-
-    except Exception as e:
-        logger.error(f"Agent execution failed: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
-
 @router.post("/run_agent_async", response_model=AgentRunResponse)
-async def run_agent_async(req: AgentRunRequest):
+async def run_agent_async(req: AgentRunRequest, request: Request):
     """Runs the Gemini Computer Use Agent with the given goal asynchronously"""
 
     try:
@@ -81,19 +43,15 @@ async def run_agent_async(req: AgentRunRequest):
             page_height=SCREEN_HEIGHT,
             # Read this based on env, for containers, read the respective variable
             headless=True,
+            # Nobody watches a headless browser, the circle still shows in the screenshots
+            highlight_delay_s=0,
         )
 
-        if not USE_VERTEXAI:
-            llm = GeminiComputerUseClient(api_key=GEMINI_API_KEY,
-                                          model_name=MODEL_NAME)
-        else:
-            llm = GeminiComputerUseClient(vertexai_project=VERTEXAI_PROJECT_ID,
-                                          vertexai_location=VERTEXAI_LOCATION)
-
         agent = AsyncComputerUseAgent(
-            llm_client=llm,
+            llm_client=request.app.state.llm,
             browser_manager=browser,
             max_turns=req.max_turns,
+            screenshot_max_side=SCREENSHOT_MAX_SIDE,
         )
 
         # TODO: Propagate errors/exceptions to client, supressing for now inside .run
@@ -4,7 +4,8 @@ import sys
 import asyncio
 
 from agent.config import (GEMINI_API_KEY, USE_VERTEXAI, VERTEXAI_PROJECT_ID, VERTEXAI_LOCATION,
-                          MODEL_NAME, INITIAL_URL, SCREEN_WIDTH, SCREEN_HEIGHT, MAX_AGENT_TURNS)
+                          MODEL_NAME, INITIAL_URL, SCREEN_WIDTH, SCREEN_HEIGHT, MAX_AGENT_TURNS,
+                          HIGHLIGHT_DELAY_S, SCREENSHOT_MAX_SIDE)
 from agent.system_prompt import SYSTEM_PROMPT
 from agent.browser import BrowserManager, AsyncBrowserManager
 from agent.gemini_client import GeminiClient
@@ -27,9 +28,10 @@ def run_agent_sync():
     try:
         browser = BrowserManager(page_width=SCREEN_WIDTH,
                                  page_height=SCREEN_HEIGHT,
-                                 headless=False)
+                                 headless=False,
+                                 highlight_delay_s=HIGHLIGHT_DELAY_S)
         
-        tools_list = browser.actions_map.values()
+        tools_list = browser.tools()
 
         if not USE_VERTEXAI:
             llm = GeminiClient(api_key=GEMINI_API_KEY,
@@ -67,9 +69,10 @@ async def run_agent_async():
     try:
         browser = AsyncBrowserManager(page_width=SCREEN_WIDTH,
                                      page_height=SCREEN_HEIGHT,
-                                     headless=False)
+                                     headless=False,
+                                     highlight_delay_s=HIGHLIGHT_DELAY_S)
         
-        tools_list = browser.actions_map.values()
+        tools_list = browser.tools()
 
         if not USE_VERTEXAI:
             llm = GeminiClient(api_key=GEMINI_API_KEY,
@@ -85,7 +88,8 @@ async def run_agent_async():
 
         agent = AsyncComputerUseAgent(llm_client=llm,
                                       browser_manager=browser,
-                                      max_turns=MAX_AGENT_TURNS)
+                                      max_turns=MAX_AGENT_TURNS,
+                                      screenshot_max_side=SCREENSHOT_MAX_SIDE)
 
         await agent.run(goal=args.goal, initial_url=args.initial_url or INITIAL_URL)
 